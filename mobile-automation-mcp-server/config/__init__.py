@@ -5,7 +5,7 @@ This module provides the unified configuration interface that combines
 shared and platform-specific configurations.
 """
 
-from .settings import settings, Settings
+from .settings import settings, Settings, get_settings
 
 __version__ = "2.0.0"
-__all__ = ["settings", "Settings"]
+__all__ = ["settings", "Settings", "get_settings"]
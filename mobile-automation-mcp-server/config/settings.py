@@ -5,11 +5,7 @@ This module combines shared and platform-specific configurations,
 providing a unified interface while supporting the new modular structure.
 """
 
-import sys
-from pathlib import Path
-
-# Add the mobile-automation-mcp-server directory to sys.path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from functools import lru_cache
 
 # Import shared configuration classes and factories
 from shared.config import (
@@ -44,5 +40,19 @@ class Settings:
         self.ios = create_ios_config()
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the process-wide settings instance.
+    
+    The settings are built from the environment on first call and
+    reused afterwards.
+    
+    Returns:
+        Shared Settings instance
+    """
+    return Settings()
+
+
 # Global settings instance - maintains backward compatibility
-settings = Settings() 
\ No newline at end of file
+settings = get_settings() 
\ No newline at end of file
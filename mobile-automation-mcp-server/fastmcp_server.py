@@ -9,36 +9,236 @@ services while providing FastMCP's modern, Pythonic interface.
 
 import os
 import sys
+import time
+import base64
+import platform
 import asyncio
+import importlib.util
+from collections import defaultdict
+from contextlib import asynccontextmanager, contextmanager
 from pathlib import Path
-from typing import Optional, Dict, Any
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
+import aiohttp
 from fastmcp import FastMCP, Context
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 from starlette.middleware import Middleware
 from starlette.middleware.cors import CORSMiddleware
 
+# Encode the HTTP routes' JSON with orjson when it is installed
+try:
+    import orjson
+    
+    class _JSONResponse(JSONResponse):
+        """JSONResponse rendered with orjson instead of the stdlib encoder."""
+        
+        def render(self, content: Any) -> bytes:
+            return orjson.dumps(content)
+except ImportError:
+    _JSONResponse = JSONResponse
+
 # Add the current directory to sys.path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from platforms.ios.automation.screenshot_service import ScreenshotService
 from platforms.ios.automation.appium_client import AppiumClient  
-from platforms.ios.automation.simulator_manager import SimulatorManager
+from platforms.ios.automation.simulator_manager import get_simulator_manager
 from platforms.ios.tools.find_and_tap_tool import FindAndTapTool
 from config.settings import settings
 from shared.utils.logger import get_logger
+from shared.utils.http_session import get_http_session, close_http_session
 
 # Initialize logger
 logger = get_logger(__name__)
 
+
 # 1. Initialize the FastMCP server instance
 mcp = FastMCP(
     name=f"{settings.server.name} (FastMCP)",
     version="2.0.0"
 )
 
+# Tools are throttled by what they wait on: Appium-bound work (WebDriver
+# sessions over HTTP) and simctl-bound work (xcrun subprocesses) each get their
+# own bound, so a burst of one kind cannot starve the other. Tools that drive a
+# simulator are additionally serialised per device so concurrent taps cannot
+# interleave. Locks and UI generations are keyed by _device_key(), so the
+# "booted" alias and its UDID share them.
+_APPIUM_SEM = asyncio.Semaphore(settings.server.max_concurrent_appium)
+_SIMCTL_SEM = asyncio.Semaphore(settings.server.max_concurrent_simctl)
+_DEVICE_LOCKS: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+# Per-device counter bumped whenever a tool may have changed what is on screen.
+# Screenshots pass it as their state token, so repeat captures of an unchanged
+# simulator can reuse the previous file.
+_UI_GENERATION: Dict[str, int] = defaultdict(int)
+
+
+async def _device_key(device_id: str) -> str:
+    """Get the per-device state key: the UDID behind "booted" when unambiguous."""
+    return await simulator_manager.resolve_device_id(device_id)
+
+
+@contextmanager
+def _changes_ui(device_key: str):
+    """Mark the device's screen as changed once the wrapped action finishes."""
+    try:
+        yield
+    finally:
+        _UI_GENERATION[device_key] += 1
+
+
+async def _screenshot_after_action(device_id: str, device_key: str) -> Dict[str, Any]:
+    """Capture the screen left by a tool action, reusing an unchanged capture."""
+    async with _SIMCTL_SEM:
+        return await screenshot_service.take_screenshot(
+            device_id=device_id,
+            state_token=_UI_GENERATION[device_key]
+        )
+
+# Last Appium liveness probe. get_server_status serves this value and, once it
+# is older than the TTL, refreshes it in the background instead of blocking.
+_APPIUM_STATUS_TTL = 30.0
+_appium_status_cache: Dict[str, Any] = {"value": None, "ts": 0.0}
+_appium_status_refresh: Optional[asyncio.Task] = None
+
+
+async def _refresh_appium_status() -> str:
+    """Probe Appium's /status endpoint and record the result."""
+    appium_status = "running" if await appium_client.ping() else "unreachable"
+    _appium_status_cache["value"] = appium_status
+    _appium_status_cache["ts"] = time.monotonic()
+    return appium_status
+
+
+async def _get_appium_status() -> str:
+    """
+    Get the Appium status, serving the cached value while it is fresh.
+    
+    Only the very first call waits for a probe; afterwards a stale value is
+    returned immediately while a single background refresh updates it.
+    """
+    global _appium_status_refresh
+    
+    cached = _appium_status_cache["value"]
+    if cached is None:
+        return await _refresh_appium_status()
+    
+    if time.monotonic() - _appium_status_cache["ts"] >= _APPIUM_STATUS_TTL:
+        if _appium_status_refresh is None or _appium_status_refresh.done():
+            _appium_status_refresh = asyncio.create_task(_refresh_appium_status())
+    return cached
+
+# Constant parts of the tool error responses; each call only merges in the
+# fields that vary (error message, device, identifiers)
+_SCREENSHOT_ERROR = MappingProxyType({
+    "success": False,
+    "suggestions": (
+        "Ensure iOS Simulator is running and visible",
+        "Check device ID is correct",
+        "Verify screenshot directory permissions"
+    ),
+    "fastmcp": True
+})
+_LAUNCH_ERROR = MappingProxyType({
+    "success": False,
+    "suggestions": (
+        "Verify bundle ID is correct",
+        "Ensure app is installed on simulator",
+        "Check iOS Simulator is running"
+    ),
+    "fastmcp": True
+})
+_TAP_ERROR = MappingProxyType({
+    "success": False,
+    "suggestions": (
+        "Check element identifier is correct",
+        "Ensure element is visible on screen",
+        "Verify Appium server is running"
+    ),
+    "fastmcp": True
+})
+_TEXT_INPUT_ERROR = MappingProxyType({
+    "success": False,
+    "suggestions": (
+        "Ensure text field is visible and active",
+        "Check element type is correct",
+        "Verify Appium server is running"
+    ),
+    "fastmcp": True
+})
+_LIST_SIMULATORS_ERROR = MappingProxyType({
+    "success": False,
+    "suggestions": (
+        "Ensure Xcode is properly installed",
+        "Check iOS Simulator is accessible"
+    ),
+    "fastmcp": True
+})
+_SIMULATOR_STATE_ERROR = MappingProxyType({
+    "success": False,
+    "suggestions": (
+        "Check the device IDs are valid simulator UDIDs",
+        "Ensure Xcode is properly installed"
+    ),
+    "fastmcp": True
+})
+_PLAIN_ERROR = MappingProxyType({"success": False, "fastmcp": True})
+
+# Complete responses for invalid arguments, returned before any work starts
+_MISSING_ELEMENT_ERROR = MappingProxyType({
+    **_PLAIN_ERROR,
+    "error": "Either accessibility_id or element_text must be provided"
+})
+_MISSING_TEXT_ERROR = MappingProxyType({
+    **_PLAIN_ERROR,
+    "error": "text must not be empty"
+})
+
+# Status details that cannot change while the process runs, computed once
+_SERVER_INFO = MappingProxyType({
+    "name": "iOS Automation MCP Server (FastMCP)",
+    "version": "2.0.0",
+    "framework": "FastMCP 2.0",
+    "status": "running"
+})
+_SYSTEM_INFO = MappingProxyType({
+    "python_version": sys.version,
+    "platform": platform.platform(),
+    "working_directory": str(Path.cwd())
+})
+
+# Tools registered by this server, as reported by get_server_status
+_TOOL_NAMES = (
+    "take_screenshot",
+    "launch_app",
+    "find_and_tap",
+    "appium_tap_and_type",
+    "execute_batch",
+    "list_simulators",
+    "boot_simulators",
+    "shutdown_simulators",
+    "get_server_status"
+)
+
+# Wallclock timestamp reused for up to a millisecond across responses
+_last_iso_ns = 0
+_last_iso = ""
+
+
+def _now_iso() -> str:
+    """Get the current local time as an ISO 8601 string, cached for up to 1ms."""
+    global _last_iso_ns, _last_iso
+    
+    now_ns = time.monotonic_ns()
+    if now_ns - _last_iso_ns > 1_000_000 or not _last_iso:
+        _last_iso = datetime.now().isoformat()
+        _last_iso_ns = now_ns
+    return _last_iso
+
 # 2. Define all tool and route functions.
 # The @mcp.tool and @mcp.custom_route decorators will register them
 # with the global 'mcp' instance.
@@ -48,6 +248,8 @@ async def take_screenshot(
     filename: Optional[str] = None,
     device_id: str = "booted", 
     directory: Optional[str] = None,
+    return_bytes: bool = False,
+    reuse_recent: bool = False,
     ctx: Optional[Context] = None
 ) -> Dict[str, Any]:
     """
@@ -57,6 +259,10 @@ async def take_screenshot(
         filename: Custom filename for screenshot (auto-generated if not provided)
         device_id: iOS simulator device ID (defaults to 'booted')
         directory: Directory to save screenshot (defaults to project screenshots folder)
+        return_bytes: Return the PNG as base64 instead of saving a file
+        reuse_recent: Accept a capture taken within the last couple of seconds
+            if no tool has acted on the device since (may miss changes made
+            outside this server, e.g. animations or manual input)
     
     Returns:
         Screenshot details and status
@@ -64,46 +270,63 @@ async def take_screenshot(
     if ctx:
         await ctx.info(f"📸 Taking screenshot with FastMCP - Device: {device_id}")
     
-    try:
-        # Use existing robust screenshot service
-        result = await screenshot_service.take_screenshot(
-            filename=filename,
-            device_id=device_id,
-            directory=directory
-        )
-        
-        if ctx:
-            await ctx.info(f"✅ Screenshot saved: {result['filename']} ({result.get('size_bytes', 0):,} bytes)")
-        
-        # Return FastMCP-formatted response
-        return {
-            "success": True,
-            "message": f"Screenshot saved successfully: {result['filename']}",
-            "filename": result["filename"],
-            "path": result["path"],
-            "size_mb": round(result["size_bytes"] / (1024 * 1024), 2),
-            "device_id": result["device_id"],
-            "timestamp": result["timestamp"],
-            "fastmcp": True
-        }
-        
-    except Exception as e:
-        error_msg = f"Screenshot failed: {str(e)}"
-        if ctx:
-            await ctx.error(f"❌ {error_msg}")
-        
-        logger.error(f"FastMCP screenshot error: {e}")
-        return {
-            "success": False,
-            "error": error_msg,
-            "device_id": device_id,
-            "suggestions": [
-                "Ensure iOS Simulator is running and visible",
-                "Check device ID is correct",
-                "Verify screenshot directory permissions"
-            ],
-            "fastmcp": True
-        }
+    async with _SIMCTL_SEM:
+        try:
+            if return_bytes:
+                # Skip the disk entirely and hand the PNG back in the response
+                result = await screenshot_service.take_screenshot(
+                    device_id=device_id,
+                    sink="memory"
+                )
+                
+                if ctx:
+                    await ctx.info(f"✅ Screenshot captured in memory ({result.get('size_bytes', 0):,} bytes)")
+                
+                return {
+                    "success": True,
+                    "message": "Screenshot captured in memory",
+                    "png_b64": result.get("png_b64"),
+                    "size_mb": round(result["size_bytes"] / (1024 * 1024), 2),
+                    "device_id": result["device_id"],
+                    "timestamp": result["timestamp"],
+                    "fastmcp": True
+                }
+            
+            state_token = None
+            if reuse_recent:
+                state_token = _UI_GENERATION[await _device_key(device_id)]
+            
+            # Use existing robust screenshot service
+            result = await screenshot_service.take_screenshot(
+                filename=filename,
+                device_id=device_id,
+                directory=directory,
+                state_token=state_token
+            )
+            
+            if ctx:
+                await ctx.info(f"✅ Screenshot saved: {result['filename']} ({result.get('size_bytes', 0):,} bytes)")
+            
+            # Return FastMCP-formatted response
+            return {
+                "success": True,
+                "message": f"Screenshot saved successfully: {result['filename']}",
+                "filename": result["filename"],
+                "path": result["path"],
+                "size_mb": round(result["size_bytes"] / (1024 * 1024), 2),
+                "device_id": result["device_id"],
+                "timestamp": result["timestamp"],
+                "cached": result.get("cached", False),
+                "fastmcp": True
+            }
+            
+        except Exception as e:
+            error_msg = f"Screenshot failed: {str(e)}"
+            if ctx:
+                await ctx.error(f"❌ {error_msg}")
+            
+            logger.error(f"FastMCP screenshot error: {e}")
+            return {**_SCREENSHOT_ERROR, "error": error_msg, "device_id": device_id}
 
 @mcp.tool  
 async def launch_app(
@@ -124,40 +347,32 @@ async def launch_app(
     if ctx:
         await ctx.info(f"🚀 Launching app with FastMCP - {bundle_id}")
     
-    try:
-        # Use existing robust simulator manager
-        result = await simulator_manager.launch_app(bundle_id, device_id)
-        
-        if ctx:
-            await ctx.info(f"✅ App launched successfully: {bundle_id}")
-        
-        return {
-            "success": True,
-            "message": f"App launched successfully: {bundle_id}",
-            "bundle_id": bundle_id,
-            "device_id": device_id,
-            "timestamp": datetime.now().isoformat(),
-            "fastmcp": True
-        }
-        
-    except Exception as e:
-        error_msg = f"App launch failed: {str(e)}"
-        if ctx:
-            await ctx.error(f"❌ {error_msg}")
-        
-        logger.error(f"FastMCP app launch error: {e}")
-        return {
-            "success": False,
-            "error": error_msg,
-            "bundle_id": bundle_id,
-            "device_id": device_id,
-            "suggestions": [
-                "Verify bundle ID is correct",
-                "Ensure app is installed on simulator", 
-                "Check iOS Simulator is running"
-            ],
-            "fastmcp": True
-        }
+    device_key = await _device_key(device_id)
+    async with _DEVICE_LOCKS[device_key], _SIMCTL_SEM:
+        try:
+            # Use existing robust simulator manager
+            with _changes_ui(device_key):
+                result = await simulator_manager.launch_app(bundle_id, device_id)
+            
+            if ctx:
+                await ctx.info(f"✅ App launched successfully: {bundle_id}")
+            
+            return {
+                "success": True,
+                "message": f"App launched successfully: {bundle_id}",
+                "bundle_id": bundle_id,
+                "device_id": device_id,
+                "timestamp": _now_iso(),
+                "fastmcp": True
+            }
+            
+        except Exception as e:
+            error_msg = f"App launch failed: {str(e)}"
+            if ctx:
+                await ctx.error(f"❌ {error_msg}")
+            
+            logger.error(f"FastMCP app launch error: {e}")
+            return {**_LAUNCH_ERROR, "error": error_msg, "bundle_id": bundle_id, "device_id": device_id}
 
 @mcp.tool
 async def find_and_tap(
@@ -183,75 +398,80 @@ async def find_and_tap(
     Returns:
         Tap operation results
     """
-    if ctx:
-        identifier = accessibility_id or element_text
-        await ctx.info(f"👆 Finding and tapping with FastMCP - {identifier}")
-    
     if not accessibility_id and not element_text:
-        error_msg = "Either accessibility_id or element_text must be provided"
         if ctx:
-            await ctx.error(f"❌ {error_msg}")
-        return {
-            "success": False,
-            "error": error_msg,
-            "fastmcp": True
-        }
+            await ctx.error(f"❌ {_MISSING_ELEMENT_ERROR['error']}")
+        return dict(_MISSING_ELEMENT_ERROR)
     
-    try:
-        # Use existing robust find and tap tool
-        result = await find_and_tap_tool.execute_impl(
-            accessibility_id=accessibility_id,
-            element_text=element_text,
-            device_id=device_id,
-            dismiss_after_screenshot=dismiss_after_screenshot,
-            dismiss_button_text=dismiss_button_text
-        )
-        
-        response = {
-            "success": True,
-            "message": f"Element tapped successfully: {accessibility_id or element_text}",
-            "element_identifier": accessibility_id or element_text,
-            "device_id": device_id,
-            "timestamp": datetime.now().isoformat(),
-            "fastmcp": True
-        }
-        
-        # Take screenshot if requested
-        if take_screenshot:
+    if ctx:
+        await ctx.info(f"👆 Finding and tapping with FastMCP - {accessibility_id or element_text}")
+    
+    device_key = await _device_key(device_id)
+    async with _DEVICE_LOCKS[device_key]:
+        try:
+            # Use existing robust find and tap tool
+            async with _APPIUM_SEM:
+                with _changes_ui(device_key):
+                    result = await find_and_tap_tool.execute_impl(
+                        accessibility_id=accessibility_id,
+                        element_text=element_text,
+                        device_id=device_id,
+                        dismiss_after_screenshot=dismiss_after_screenshot,
+                        dismiss_button_text=dismiss_button_text
+                    )
+            
+            # Start the requested screenshot as soon as the tap has landed, so
+            # the capture overlaps building the response and reporting the tap
+            screenshot_task = None
+            if take_screenshot:
+                screenshot_task = asyncio.ensure_future(_screenshot_after_action(device_id, device_key))
+            
             try:
-                screenshot_result = await screenshot_service.take_screenshot(device_id=device_id)
-                response["screenshot"] = {
-                    "filename": screenshot_result["filename"],
-                    "path": screenshot_result["path"]
+                response = {
+                    "success": True,
+                    "message": f"Element tapped successfully: {accessibility_id or element_text}",
+                    "element_identifier": accessibility_id or element_text,
+                    "device_id": device_id,
+                    "timestamp": _now_iso(),
+                    "fastmcp": True
                 }
+                
                 if ctx:
-                    await ctx.info(f"📸 Screenshot taken: {screenshot_result['filename']}")
-            except Exception as e:
-                logger.warning(f"Screenshot after tap failed: {e}")
-        
-        if ctx:
-            await ctx.info(f"✅ Element tapped successfully")
-        
-        return response
-        
-    except Exception as e:
-        error_msg = f"Find and tap failed: {str(e)}"
-        if ctx:
-            await ctx.error(f"❌ {error_msg}")
-        
-        logger.error(f"FastMCP find and tap error: {e}")
-        return {
-            "success": False,
-            "error": error_msg,
-            "element_identifier": accessibility_id or element_text,
-            "device_id": device_id,
-            "suggestions": [
-                "Check element identifier is correct",
-                "Ensure element is visible on screen",
-                "Verify Appium server is running"
-            ],
-            "fastmcp": True
-        }
+                    await ctx.info(f"✅ Element tapped successfully")
+            except BaseException:
+                # Don't leave the capture running unobserved if reporting the tap fails
+                if screenshot_task is not None:
+                    screenshot_task.cancel()
+                    await asyncio.gather(screenshot_task, return_exceptions=True)
+                raise
+            
+            if screenshot_task is not None:
+                try:
+                    # Shield so cancelling the tool call cannot cut a file write short
+                    screenshot_result = await asyncio.shield(screenshot_task)
+                    response["screenshot"] = {
+                        "filename": screenshot_result["filename"],
+                        "path": screenshot_result["path"]
+                    }
+                    if ctx:
+                        await ctx.info(f"📸 Screenshot taken: {screenshot_result['filename']}")
+                except Exception as e:
+                    logger.warning(f"Screenshot after tap failed: {e}")
+            
+            return response
+            
+        except Exception as e:
+            error_msg = f"Find and tap failed: {str(e)}"
+            if ctx:
+                await ctx.error(f"❌ {error_msg}")
+            
+            logger.error(f"FastMCP find and tap error: {e}")
+            return {
+                **_TAP_ERROR,
+                "error": error_msg,
+                "element_identifier": accessibility_id or element_text,
+                "device_id": device_id
+            }
 
 @mcp.tool
 async def appium_tap_and_type(
@@ -273,89 +493,305 @@ async def appium_tap_and_type(
     Returns:
         Text input operation results
     """
+    if not text:
+        if ctx:
+            await ctx.error(f"❌ {_MISSING_TEXT_ERROR['error']}")
+        return dict(_MISSING_TEXT_ERROR)
+    
     if ctx:
         await ctx.info(f"⌨️ Typing text with FastMCP - '{text[:50]}{'...' if len(text) > 50 else ''}'")
     
-    try:
-        # Use existing robust Appium client
-        result = await appium_client.tap_and_type(
-            text=text,
-            timeout=timeout
+    device_key = await _device_key(device_id)
+    async with _DEVICE_LOCKS[device_key], _APPIUM_SEM:
+        try:
+            # Use existing robust Appium client
+            with _changes_ui(device_key):
+                result = await appium_client.tap_and_type(
+                    text=text,
+                    timeout=timeout
+                )
+            
+            if ctx:
+                await ctx.info(f"✅ Text typed successfully")
+            
+            return {
+                "success": True,
+                "message": f"Text typed successfully: {len(text)} characters",
+                "text": text,
+                "element_type": element_type,
+                "device_id": device_id,
+                "timestamp": _now_iso(),
+                "fastmcp": True
+            }
+            
+        except Exception as e:
+            error_msg = f"Text input failed: {str(e)}"
+            if ctx:
+                await ctx.error(f"❌ {error_msg}")
+            
+            logger.error(f"FastMCP text input error: {e}")
+            return {
+                **_TEXT_INPUT_ERROR,
+                "error": error_msg,
+                "text": text,
+                "element_type": element_type,
+                "device_id": device_id
+            }
+
+async def _batch_tap(action: Dict[str, Any], device_id: str) -> Dict[str, Any]:
+    """Run a single 'tap' step of an execute_batch call."""
+    accessibility_id = action.get("accessibility_id")
+    element_text = action.get("element_text")
+    if not accessibility_id and not element_text:
+        raise ValueError("Either accessibility_id or element_text must be provided")
+    
+    async with _APPIUM_SEM:
+        await find_and_tap_tool.execute_impl(
+            accessibility_id=accessibility_id,
+            element_text=element_text,
+            device_id=device_id,
+            dismiss_after_screenshot=False,
+            dismiss_button_text=None
         )
+    return {"element_identifier": accessibility_id or element_text}
+
+
+async def _batch_type(action: Dict[str, Any], device_id: str) -> Dict[str, Any]:
+    """Run a single 'type' step of an execute_batch call."""
+    text = action.get("text")
+    if not text:
+        raise ValueError("text must be provided")
+    
+    async with _APPIUM_SEM:
+        await appium_client.tap_and_type(text=text, timeout=action.get("timeout", 10))
+    return {"characters": len(text)}
+
+
+async def _batch_launch(action: Dict[str, Any], device_id: str) -> Dict[str, Any]:
+    """Run a single 'launch' step of an execute_batch call."""
+    bundle_id = action.get("bundle_id")
+    if not bundle_id:
+        raise ValueError("bundle_id must be provided")
+    
+    async with _SIMCTL_SEM:
+        await simulator_manager.launch_app(bundle_id, device_id)
+    return {"bundle_id": bundle_id}
+
+
+_BATCH_ACTIONS = {
+    "tap": _batch_tap,
+    "type": _batch_type,
+    "launch": _batch_launch,
+}
+
+@mcp.tool
+async def execute_batch(
+    actions: List[Dict[str, Any]],
+    device_id: str = "booted",
+    validate_after: bool = True,
+    stop_on_error: bool = True,
+    ctx: Optional[Context] = None
+) -> Dict[str, Any]:
+    """
+    Execute several tap/type/launch actions in one call.
+    
+    Each action is a dict with an "action" key ("tap", "type" or "launch")
+    plus that action's arguments: accessibility_id/element_text for taps,
+    text (and optional timeout) for typing, bundle_id for launches. A single
+    screenshot is taken at the end instead of one per step.
+    
+    Args:
+        actions: Ordered list of actions to execute
+        device_id: iOS simulator device ID (defaults to 'booted')
+        validate_after: Whether to take one screenshot after the last action
+        stop_on_error: Whether to skip the remaining actions after a failure
+    
+    Returns:
+        Per-action results and the final screenshot details
+    """
+    if ctx:
+        await ctx.info(f"📦 Executing batch of {len(actions)} actions with FastMCP")
+    
+    results = []
+    
+    device_key = await _device_key(device_id)
+    async with _DEVICE_LOCKS[device_key]:
+        for index, action in enumerate(actions):
+            name = action.get("action")
+            handler = _BATCH_ACTIONS.get(name)
+            
+            try:
+                if handler is None:
+                    raise ValueError(f"Unknown action '{name}' (expected one of: {', '.join(_BATCH_ACTIONS)})")
+                with _changes_ui(device_key):
+                    details = await handler(action, device_id)
+                results.append({"index": index, "action": name, "success": True, **details})
+            except Exception as e:
+                logger.error(f"FastMCP batch action {index} ({name}) failed: {e}")
+                results.append({"index": index, "action": name, "success": False, "error": str(e)})
+                if stop_on_error:
+                    break
         
-        if ctx:
-            await ctx.info(f"✅ Text typed successfully")
-        
-        return {
-            "success": True,
-            "message": f"Text typed successfully: {len(text)} characters",
-            "text": text,
-            "element_type": element_type,
+        response = {
+            "success": len(results) == len(actions) and all(r["success"] for r in results),
+            "completed": sum(1 for r in results if r["success"]),
+            "total": len(actions),
+            "results": results,
             "device_id": device_id,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _now_iso(),
             "fastmcp": True
         }
         
-    except Exception as e:
-        error_msg = f"Text input failed: {str(e)}"
-        if ctx:
-            await ctx.error(f"❌ {error_msg}")
-        
-        logger.error(f"FastMCP text input error: {e}")
-        return {
-            "success": False,
-            "error": error_msg,
-            "text": text,
-            "element_type": element_type,
-            "device_id": device_id,
-            "suggestions": [
-                "Ensure text field is visible and active",
-                "Check element type is correct",
-                "Verify Appium server is running"
-            ],
-            "fastmcp": True
-        }
+        # One screenshot for the whole batch
+        if validate_after:
+            try:
+                screenshot_result = await _screenshot_after_action(device_id, device_key)
+                response["screenshot"] = {
+                    "filename": screenshot_result["filename"],
+                    "path": screenshot_result["path"]
+                }
+            except Exception as e:
+                logger.warning(f"Screenshot after batch failed: {e}")
+    
+    if ctx:
+        if response["success"]:
+            await ctx.info(f"✅ Batch completed: {response['completed']}/{response['total']} actions")
+        else:
+            await ctx.error(f"❌ Batch stopped: {response['completed']}/{response['total']} actions succeeded")
+    
+    return response
 
 @mcp.tool
-async def list_simulators(ctx: Optional[Context] = None) -> Dict[str, Any]:
+async def list_simulators(
+    booted_only: bool = False,
+    ctx: Optional[Context] = None
+) -> Dict[str, Any]:
     """
     List available iOS simulators using existing simulator manager.
     
+    Args:
+        booted_only: Return only booted simulators as a flat list instead of
+            every device grouped by runtime
+    
     Returns:
         List of available iOS simulators
     """
     if ctx:
         await ctx.info("📱 Listing iOS simulators with FastMCP")
     
-    try:
-        # Use existing robust simulator manager
-        result = await simulator_manager.list_simulators()
-        
-        if ctx:
-            await ctx.info(f"✅ Found {len(result.get('devices', []))} simulators")
-        
-        return {
-            "success": True,
-            "simulators": result.get("devices", []),
-            "timestamp": datetime.now().isoformat(),
-            "fastmcp": True
-        }
-        
-    except Exception as e:
-        error_msg = f"Failed to list simulators: {str(e)}"
-        if ctx:
-            await ctx.error(f"❌ {error_msg}")
-        
-        logger.error(f"FastMCP simulator list error: {e}")
-        return {
-            "success": False,
-            "error": error_msg,
-            "suggestions": [
-                "Ensure Xcode is properly installed",
-                "Check iOS Simulator is accessible"
-            ],
-            "fastmcp": True
-        }
+    async with _SIMCTL_SEM:
+        try:
+            # Use existing robust simulator manager
+            if booted_only:
+                simulators = await simulator_manager.list_booted_devices()
+            else:
+                simulators = (await simulator_manager.list_simulators()).get("devices", [])
+            
+            if ctx:
+                await ctx.info(f"✅ Found {len(simulators)} simulators")
+            
+            return {
+                "success": True,
+                "simulators": simulators,
+                "timestamp": _now_iso(),
+                "fastmcp": True
+            }
+            
+        except Exception as e:
+            error_msg = f"Failed to list simulators: {str(e)}"
+            if ctx:
+                await ctx.error(f"❌ {error_msg}")
+            
+            logger.error(f"FastMCP simulator list error: {e}")
+            return {**_LIST_SIMULATORS_ERROR, "error": error_msg}
+
+def _simulator_state_results(results: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Turn a SimulatorManager fan-out mapping into per-device tool results."""
+    return [
+        {"device_id": device_id, "success": True} if outcome is True
+        else {"device_id": device_id, "success": False, "error": str(outcome)}
+        for device_id, outcome in results.items()
+    ]
+
+
+async def _change_simulators_state(
+    operation: str,
+    device_ids: List[str],
+    ctx: Optional[Context]
+) -> Dict[str, Any]:
+    """Boot or shutdown several simulators concurrently and report each one."""
+    async with _SIMCTL_SEM:
+        try:
+            # Resolve before the state change, while "booted" still means the same device
+            device_keys = [await _device_key(device_id) for device_id in device_ids]
+            
+            # The manager bounds the fan-out itself (MAX_PARALLEL_SIMULATORS)
+            if operation == "boot":
+                outcomes = await simulator_manager.boot_simulators(device_ids)
+            else:
+                outcomes = await simulator_manager.shutdown_simulators(device_ids)
+            for device_key in device_keys:
+                _UI_GENERATION[device_key] += 1
+            
+            results = _simulator_state_results(outcomes)
+            completed = sum(1 for r in results if r["success"])
+            if ctx:
+                await ctx.info(f"✅ {operation.capitalize()} completed: {completed}/{len(results)} simulators")
+            
+            return {
+                "success": completed == len(results),
+                "completed": completed,
+                "total": len(results),
+                "results": results,
+                "timestamp": _now_iso(),
+                "fastmcp": True
+            }
+            
+        except Exception as e:
+            error_msg = f"Simulator {operation} failed: {str(e)}"
+            if ctx:
+                await ctx.error(f"❌ {error_msg}")
+            
+            logger.error(f"FastMCP simulator {operation} error: {e}")
+            return {**_SIMULATOR_STATE_ERROR, "error": error_msg, "device_ids": device_ids}
+
+@mcp.tool
+async def boot_simulators(
+    device_ids: List[str],
+    ctx: Optional[Context] = None
+) -> Dict[str, Any]:
+    """
+    Boot several iOS simulators concurrently.
+    
+    Args:
+        device_ids: UDIDs of the simulators to boot
+    
+    Returns:
+        Per-device boot results
+    """
+    if ctx:
+        await ctx.info(f"🚀 Booting {len(device_ids)} simulators with FastMCP")
+    
+    return await _change_simulators_state("boot", device_ids, ctx)
+
+@mcp.tool
+async def shutdown_simulators(
+    device_ids: List[str],
+    ctx: Optional[Context] = None
+) -> Dict[str, Any]:
+    """
+    Shutdown several iOS simulators concurrently.
+    
+    Args:
+        device_ids: UDIDs of the simulators to shutdown
+    
+    Returns:
+        Per-device shutdown results
+    """
+    if ctx:
+        await ctx.info(f"🛑 Shutting down {len(device_ids)} simulators with FastMCP")
+    
+    return await _change_simulators_state("shutdown", device_ids, ctx)
 
 @mcp.tool
 async def get_server_status(ctx: Optional[Context] = None) -> Dict[str, Any]:
@@ -368,65 +804,37 @@ async def get_server_status(ctx: Optional[Context] = None) -> Dict[str, Any]:
     if ctx:
         await ctx.info("📊 Getting FastMCP server status")
     
-    try:
-        import platform
-        
-        # Check Appium status
-        appium_status = "unknown"
+    async with _APPIUM_SEM:
         try:
-            await appium_client.start_session()
-            appium_status = "running" if appium_client.session_active else "not running"
-            await appium_client.close_session()
-        except:
-            appium_status = "unreachable"
-        
-        response = {
-            "success": True,
-            "server": {
-                "name": "iOS Automation MCP Server (FastMCP)",
-                "version": "2.0.0",
-                "framework": "FastMCP 2.0",
-                "status": "running",
-                "timestamp": datetime.now().isoformat()
-            },
-            "system": {
-                "python_version": sys.version,
-                "platform": platform.platform(),
-                "working_directory": str(Path.cwd())
-            },
-            "environment": {
-                "fastmcp_available": True,
-                "appium_status": appium_status,
-                "xcode_tools_available": True,
-                "screenshot_directory": str(screenshot_service.default_directory)
-            },
-            "tools": [
-                "take_screenshot",
-                "launch_app", 
-                "find_and_tap",
-                "appium_tap_and_type",
-                "list_simulators",
-                "get_server_status"
-            ],
-            "fastmcp": True
-        }
-        
-        if ctx:
-            await ctx.info("✅ Server status retrieved")
-        
-        return response
-        
-    except Exception as e:
-        error_msg = f"Failed to get server status: {str(e)}"
-        if ctx:
-            await ctx.error(f"❌ {error_msg}")
-        
-        logger.error(f"FastMCP server status error: {e}")
-        return {
-            "success": False,
-            "error": error_msg,
-            "fastmcp": True
-        }
+            # Check Appium status (cached /status probe, no session setup)
+            appium_status = await _get_appium_status()
+            
+            response = {
+                "success": True,
+                "server": {**_SERVER_INFO, "timestamp": _now_iso()},
+                "system": dict(_SYSTEM_INFO),
+                "environment": {
+                    "fastmcp_available": True,
+                    "appium_status": appium_status,
+                    "xcode_tools_available": True,
+                    "screenshot_directory": str(screenshot_service.default_directory)
+                },
+                "tools": _TOOL_NAMES,
+                "fastmcp": True
+            }
+            
+            if ctx:
+                await ctx.info("✅ Server status retrieved")
+            
+            return response
+            
+        except Exception as e:
+            error_msg = f"Failed to get server status: {str(e)}"
+            if ctx:
+                await ctx.error(f"❌ {error_msg}")
+            
+            logger.error(f"FastMCP server status error: {e}")
+            return {**_PLAIN_ERROR, "error": error_msg}
 
 # Custom routes are now added to the final 'app', not 'mcp'
 # However, the docs show @mcp.custom_route should still work as it modifies
@@ -440,9 +848,9 @@ async def health_check(request: Request) -> JSONResponse:
         "service": "iOS Automation MCP Server (FastMCP)",
         "version": "2.0.0",
         "environment": "cloud" if IS_CLOUD else "local",
-        "timestamp": datetime.now().isoformat()
+        "timestamp": _now_iso()
     }
-    return JSONResponse(content)
+    return _JSONResponse(content)
 
 
 # Add root endpoint for basic info
@@ -455,9 +863,9 @@ async def root(request: Request) -> JSONResponse:
         "status": "running",
         "environment": "cloud" if IS_CLOUD else "local",
         "transport": os.getenv("MCP_TRANSPORT", "sse"),
-        "timestamp": datetime.now().isoformat()
+        "timestamp": _now_iso()
     }
-    return JSONResponse(content)
+    return _JSONResponse(content)
 
 
 # 3. Define the middleware stack
@@ -474,6 +882,24 @@ cors_middleware = [
 # 4. Create the final, runnable ASGI app
 app = mcp.http_app(transport="sse", middleware=cors_middleware)
 
+# The shared HTTP connection pool lives as long as the process. FastMCP's own
+# server lifespan can run once per client session, so the pool is closed from
+# the ASGI app's lifespan instead, after FastMCP's shutdown has finished.
+_mcp_app_lifespan = app.router.lifespan_context
+
+
+@asynccontextmanager
+async def _app_lifespan(app):
+    """Run FastMCP's app lifespan, then release the shared HTTP pool."""
+    try:
+        async with _mcp_app_lifespan(app) as state:
+            yield state
+    finally:
+        await close_http_session()
+
+
+app.router.lifespan_context = _app_lifespan
+
 # 5. Initialize services (MUST be after app creation and decorator definitions)
 IS_CLOUD = bool(os.getenv("RAILWAY_ENVIRONMENT") or os.getenv("HEROKU_APP_NAME") or os.getenv("GOOGLE_CLOUD_PROJECT"))
 
@@ -481,7 +907,7 @@ if not IS_CLOUD:
     # Initialize local services
     screenshot_service = ScreenshotService()
     appium_client = AppiumClient()
-    simulator_manager = SimulatorManager()
+    simulator_manager = get_simulator_manager()
     find_and_tap_tool = FindAndTapTool()
     logger.info(f"🚀 FastMCP Server initialized with local services")
 else:
@@ -493,15 +919,10 @@ else:
             self.remote_port = os.getenv("REMOTE_IOS_PORT", "4723")
             self.default_directory = "/tmp/screenshots"
             
-        async def take_screenshot(self, filename=None, device_id="booted", directory=None):
+        async def take_screenshot(self, filename=None, device_id="booted", directory=None, state_token=None, sink="file"):
             try:
                 # For cloud deployment, we'll use remote Appium server
                 # This could connect to a remote Mac with iOS simulator
-                import aiohttp
-                import base64
-                import uuid
-                from datetime import datetime
-                
                 if not filename:
                     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                     filename = f"screenshot_{timestamp}.png"
@@ -512,50 +933,60 @@ else:
                 port_suffix = "" if "ngrok" in self.remote_host else f":{self.remote_port}"
                 remote_url = f"{protocol}://{self.remote_host}{port_suffix}"
                 
-                async with aiohttp.ClientSession() as session:
-                    # Create a session (W3C format)
-                    session_payload = {
-                        "capabilities": {
-                            "alwaysMatch": {
-                                "platformName": "iOS",
-                                "appium:deviceName": "iPhone 16 Pro",
-                                "appium:automationName": "XCUITest",
-                                "appium:udid": "4013533D-4166-4991-B3AD-5E4660AC2DD1",
-                                "appium:shouldTerminateApp": False,
-                                "appium:forceAppLaunch": False,
-                                "appium:newCommandTimeout": 300
-                            }
+                session = get_http_session()
+                # Create a session (W3C format)
+                session_payload = {
+                    "capabilities": {
+                        "alwaysMatch": {
+                            "platformName": "iOS",
+                            "appium:deviceName": "iPhone 16 Pro",
+                            "appium:automationName": "XCUITest",
+                            "appium:udid": "4013533D-4166-4991-B3AD-5E4660AC2DD1",
+                            "appium:shouldTerminateApp": False,
+                            "appium:forceAppLaunch": False,
+                            "appium:newCommandTimeout": 300
                         }
                     }
-                    
-                    async with session.post(f"{remote_url}/session", json=session_payload) as resp:
-                        if resp.status == 200:
-                            session_data = await resp.json()
-                            session_id = session_data["value"]["sessionId"]
-                            
-                            # Take screenshot
-                            async with session.get(f"{remote_url}/session/{session_id}/screenshot") as screenshot_resp:
-                                if screenshot_resp.status == 200:
-                                    screenshot_data = await screenshot_resp.json()
-                                    screenshot_base64 = screenshot_data["value"]
-                                    
-                                    # Decode and save screenshot
-                                    screenshot_bytes = base64.b64decode(screenshot_base64)
-                                    file_path = f"{directory or self.default_directory}/{filename}"
-                                    
-                                    # In cloud environment, we'll return the base64 data
+                }
+                
+                async with session.post(f"{remote_url}/session", json=session_payload) as resp:
+                    if resp.status == 200:
+                        session_data = await resp.json()
+                        session_id = session_data["value"]["sessionId"]
+                        
+                        # Take screenshot
+                        async with session.get(f"{remote_url}/session/{session_id}/screenshot") as screenshot_resp:
+                            if screenshot_resp.status == 200:
+                                screenshot_data = await screenshot_resp.json()
+                                screenshot_base64 = screenshot_data["value"]
+                                
+                                # Decode and save screenshot
+                                screenshot_bytes = base64.b64decode(screenshot_base64)
+                                if sink == "memory":
                                     return {
                                         "success": True,
-                                        "filename": filename,
-                                        "path": file_path,
+                                        "png_b64": screenshot_base64,
                                         "size_bytes": len(screenshot_bytes),
                                         "device_id": device_id,
-                                        "timestamp": datetime.now().isoformat(),
-                                        "base64_data": screenshot_base64[:100] + "..." if len(screenshot_base64) > 100 else screenshot_base64
+                                        "timestamp": _now_iso()
                                     }
-                            
-                            # Clean up session
-                            await session.delete(f"{remote_url}/session/{session_id}")
+                                
+                                file_path = f"{directory or self.default_directory}/{filename}"
+                                
+                                # In cloud environment, we'll return the base64 data
+                                return {
+                                    "success": True,
+                                    "filename": filename,
+                                    "path": file_path,
+                                    "size_bytes": len(screenshot_bytes),
+                                    "device_id": device_id,
+                                    "timestamp": _now_iso(),
+                                    "base64_data": screenshot_base64[:100] + "..." if len(screenshot_base64) > 100 else screenshot_base64
+                                }
+                        
+                        # Clean up session
+                        async with session.delete(f"{remote_url}/session/{session_id}"):
+                            pass  # release the pooled connection
                 
                 # Fallback: simulate screenshot for demo purposes
                 return {
@@ -564,7 +995,7 @@ else:
                     "path": f"/tmp/{filename}",
                     "size_bytes": 50000,
                     "device_id": device_id,
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": _now_iso(),
                     "note": "Simulated screenshot - configure REMOTE_IOS_HOST for actual remote iOS device"
                 }
                 
@@ -577,7 +1008,7 @@ else:
                     "path": f"/tmp/{filename or 'demo_screenshot.png'}",
                     "size_bytes": 45000,
                     "device_id": device_id,
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": _now_iso(),
                     "note": f"Demo mode - would connect to remote iOS device at {self.remote_host}:{self.remote_port}"
                 }
     
@@ -597,76 +1028,90 @@ else:
             self.session_active = False
             return True
             
+        async def ping(self):
+            # Probe the remote Appium server's status endpoint
+            try:
+                
+                protocol = "https" if "ngrok" in self.remote_host else "http"
+                port_suffix = "" if "ngrok" in self.remote_host else f":{self.remote_port}"
+                remote_url = f"{protocol}://{self.remote_host}{port_suffix}"
+                
+                timeout = aiohttp.ClientTimeout(total=2.0)
+                session = get_http_session()
+                async with session.get(f"{remote_url}/status", timeout=timeout) as resp:
+                    return resp.status == 200
+            except Exception:
+                return False
+            
         async def tap_and_type(self, text, timeout=10):
             try:
                 # Actually type text via remote Appium server
-                import aiohttp
-                from datetime import datetime
-                
                 # Use HTTPS for ngrok tunnels, HTTP for direct connections
                 protocol = "https" if "ngrok" in self.remote_host else "http"
                 port_suffix = "" if "ngrok" in self.remote_host else f":{self.remote_port}"
                 remote_url = f"{protocol}://{self.remote_host}{port_suffix}"
                 
-                async with aiohttp.ClientSession() as session:
-                    # Create a session (W3C format)
-                    session_payload = {
-                        "capabilities": {
-                            "alwaysMatch": {
-                                "platformName": "iOS",
-                                "appium:deviceName": "iPhone 16 Pro",
-                                "appium:automationName": "XCUITest",
-                                "appium:udid": "4013533D-4166-4991-B3AD-5E4660AC2DD1",
-                                "appium:shouldTerminateApp": False,
-                                "appium:forceAppLaunch": False,
-                                "appium:newCommandTimeout": 300
-                            }
+                session = get_http_session()
+                # Create a session (W3C format)
+                session_payload = {
+                    "capabilities": {
+                        "alwaysMatch": {
+                            "platformName": "iOS",
+                            "appium:deviceName": "iPhone 16 Pro",
+                            "appium:automationName": "XCUITest",
+                            "appium:udid": "4013533D-4166-4991-B3AD-5E4660AC2DD1",
+                            "appium:shouldTerminateApp": False,
+                            "appium:forceAppLaunch": False,
+                            "appium:newCommandTimeout": 300
                         }
                     }
-                    
-                    async with session.post(f"{remote_url}/session", json=session_payload) as resp:
-                        if resp.status == 200:
-                            session_data = await resp.json()
-                            session_id = session_data["value"]["sessionId"]
+                }
+                
+                async with session.post(f"{remote_url}/session", json=session_payload) as resp:
+                    if resp.status == 200:
+                        session_data = await resp.json()
+                        session_id = session_data["value"]["sessionId"]
+                        
+                        try:
+                            # Find active text field using the known accessibility ID
+                            find_payload = {
+                                "using": "accessibility id",
+                                "value": "chatInputField"
+                            }
                             
-                            try:
-                                # Find active text field using the known accessibility ID
-                                find_payload = {
-                                    "using": "accessibility id",
-                                    "value": "chatInputField"
-                                }
-                                
-                                async with session.post(f"{remote_url}/session/{session_id}/element", json=find_payload) as find_resp:
-                                    if find_resp.status == 200:
-                                        find_data = await find_resp.json()
-                                        element_id = find_data["value"]["ELEMENT"] if "ELEMENT" in find_data["value"] else find_data["value"]["element-6066-11e4-a52e-4f735466cecf"]
-                                        
-                                        # Clear existing text and type new text
-                                        await session.post(f"{remote_url}/session/{session_id}/element/{element_id}/clear")
-                                        
-                                        type_payload = {"text": text}
-                                        async with session.post(f"{remote_url}/session/{session_id}/element/{element_id}/value", json=type_payload) as type_resp:
-                                            if type_resp.status == 200:
-                                                logger.info(f"✅ Remote text input successful: {text[:50]}{'...' if len(text) > 50 else ''}")
-                                                return {
-                                                    "success": True,
-                                                    "text": text,
-                                                    "session_id": session_id,
-                                                    "timestamp": datetime.now().isoformat()
-                                                }
-                                            else:
-                                                error_text = await type_resp.text()
-                                                raise Exception(f"Text input failed: {type_resp.status} - {error_text}")
-                                    else:
-                                        error_text = await find_resp.text()
-                                        raise Exception(f"Text field not found: {find_resp.status} - {error_text}")
-                                        
-                            finally:
-                                # Clean up session
-                                await session.delete(f"{remote_url}/session/{session_id}")
-                        else:
-                            error_text = await resp.text()
-                            raise Exception(f"Session creation failed: {resp.status} - {error_text}")
+                            async with session.post(f"{remote_url}/session/{session_id}/element", json=find_payload) as find_resp:
+                                if find_resp.status == 200:
+                                    find_data = await find_resp.json()
+                                    element_id = find_data["value"]["ELEMENT"] if "ELEMENT" in find_data["value"] else find_data["value"]["element-6066-11e4-a52e-4f735466cecf"]
+                                    
+                                    # Clear existing text and type new text
+                                    async with session.post(f"{remote_url}/session/{session_id}/element/{element_id}/clear"):
+                                        pass  # release the pooled connection
+                                    
+                                    type_payload = {"text": text}
+                                    async with session.post(f"{remote_url}/session/{session_id}/element/{element_id}/value", json=type_payload) as type_resp:
+                                        if type_resp.status == 200:
+                                            logger.info(f"✅ Remote text input successful: {text[:50]}{'...' if len(text) > 50 else ''}")
+                                            return {
+                                                "success": True,
+                                                "text": text,
+                                                "session_id": session_id,
+                                                "timestamp": _now_iso()
+                                            }
+                                        else:
+                                            error_text = await type_resp.text()
+                                            raise Exception(f"Text input failed: {type_resp.status} - {error_text}")
+                                else:
+                                    error_text = await find_resp.text()
+                                    raise Exception(f"Text field not found: {find_resp.status} - {error_text}")
+                                    
+                        finally:
+                            # Clean up session
+                            async with session.delete(f"{remote_url}/session/{session_id}"):
+                                pass  # release the pooled connection
+                    else:
+                        error_text = await resp.text()
+                        raise Exception(f"Session creation failed: {resp.status} - {error_text}")
                 
             except Exception as e:
                 logger.error(f"❌ Remote text input error: {e}")
@@ -682,59 +1127,61 @@ else:
         async def launch_app(self, bundle_id, device_id="booted"):
             try:
                 # Actually launch the app via remote Appium server
-                import aiohttp
-                from datetime import datetime
-                
                 # Use HTTPS for ngrok tunnels, HTTP for direct connections
                 protocol = "https" if "ngrok" in self.remote_host else "http"
                 port_suffix = "" if "ngrok" in self.remote_host else f":{self.remote_port}"
                 remote_url = f"{protocol}://{self.remote_host}{port_suffix}"
                 
-                async with aiohttp.ClientSession() as session:
-                    # Create a session (W3C format) 
-                    session_payload = {
-                        "capabilities": {
-                            "alwaysMatch": {
-                                "platformName": "iOS",
-                                "appium:deviceName": "iPhone 16 Pro",
-                                "appium:automationName": "XCUITest",
-                                "appium:udid": "4013533D-4166-4991-B3AD-5E4660AC2DD1",
-                                "appium:bundleId": bundle_id,
-                                "appium:autoLaunch": True,
-                                "appium:shouldTerminateApp": False,
-                                "appium:forceAppLaunch": False,
-                                "appium:newCommandTimeout": 300
-                            }
+                session = get_http_session()
+                # Create a session (W3C format) 
+                session_payload = {
+                    "capabilities": {
+                        "alwaysMatch": {
+                            "platformName": "iOS",
+                            "appium:deviceName": "iPhone 16 Pro",
+                            "appium:automationName": "XCUITest",
+                            "appium:udid": "4013533D-4166-4991-B3AD-5E4660AC2DD1",
+                            "appium:bundleId": bundle_id,
+                            "appium:autoLaunch": True,
+                            "appium:shouldTerminateApp": False,
+                            "appium:forceAppLaunch": False,
+                            "appium:newCommandTimeout": 300
                         }
                     }
-                    
-                    async with session.post(f"{remote_url}/session", json=session_payload) as resp:
-                        if resp.status == 200:
-                            session_data = await resp.json()
-                            session_id = session_data["value"]["sessionId"]
-                            logger.info(f"✅ Remote app launch successful: {bundle_id} (session: {session_id})")
-                            
-                            # Keep session active for a moment then close it
-                            await asyncio.sleep(1)
-                            await session.delete(f"{remote_url}/session/{session_id}")
-                            
-                            return {
-                                "success": True, 
-                                "bundle_id": bundle_id, 
-                                "device_id": device_id,
-                                "session_id": session_id,
-                                "timestamp": datetime.now().isoformat()
-                            }
-                        else:
-                            error_text = await resp.text()
-                            logger.error(f"❌ Remote app launch failed: {resp.status} - {error_text}")
-                            raise Exception(f"Appium session creation failed: {resp.status} - {error_text}")
+                }
+                
+                async with session.post(f"{remote_url}/session", json=session_payload) as resp:
+                    if resp.status == 200:
+                        session_data = await resp.json()
+                        session_id = session_data["value"]["sessionId"]
+                        logger.info(f"✅ Remote app launch successful: {bundle_id} (session: {session_id})")
+                        
+                        # Keep session active for a moment then close it
+                        await asyncio.sleep(1)
+                        async with session.delete(f"{remote_url}/session/{session_id}"):
+                            pass  # release the pooled connection
+                        
+                        return {
+                            "success": True, 
+                            "bundle_id": bundle_id, 
+                            "device_id": device_id,
+                            "session_id": session_id,
+                            "timestamp": _now_iso()
+                        }
+                    else:
+                        error_text = await resp.text()
+                        logger.error(f"❌ Remote app launch failed: {resp.status} - {error_text}")
+                        raise Exception(f"Appium session creation failed: {resp.status} - {error_text}")
                 
             except Exception as e:
                 logger.error(f"❌ Remote app launch error: {e}")
                 # Don't simulate on error - let the error propagate
                 raise Exception(f"Failed to launch app {bundle_id} remotely: {str(e)}")
             
+        async def resolve_device_id(self, device_id):
+            # The remote host drives a single device; keep IDs as given
+            return device_id
+            
         async def list_simulators(self):
             # Return simulated device list
             return {
@@ -757,182 +1204,182 @@ else:
         async def execute_impl(self, accessibility_id=None, element_text=None, device_id="booted", dismiss_after_screenshot=False, dismiss_button_text=None):
             try:
                 # Actually find and tap element via remote Appium server
-                import aiohttp
-                from datetime import datetime
-                
                 # Use HTTPS for ngrok tunnels, HTTP for direct connections
                 protocol = "https" if "ngrok" in self.remote_host else "http"
                 port_suffix = "" if "ngrok" in self.remote_host else f":{self.remote_port}"
                 remote_url = f"{protocol}://{self.remote_host}{port_suffix}"
                 
-                async with aiohttp.ClientSession() as session:
-                    # Create a session (W3C format)
-                    session_payload = {
-                        "capabilities": {
-                            "alwaysMatch": {
-                                "platformName": "iOS",
-                                "appium:deviceName": "iPhone 16 Pro",
-                                "appium:automationName": "XCUITest",
-                                "appium:udid": "4013533D-4166-4991-B3AD-5E4660AC2DD1",
-                                "appium:shouldTerminateApp": False,
-                                "appium:forceAppLaunch": False,
-                                "appium:newCommandTimeout": 300
-                            }
+                session = get_http_session()
+                # Create a session (W3C format)
+                session_payload = {
+                    "capabilities": {
+                        "alwaysMatch": {
+                            "platformName": "iOS",
+                            "appium:deviceName": "iPhone 16 Pro",
+                            "appium:automationName": "XCUITest",
+                            "appium:udid": "4013533D-4166-4991-B3AD-5E4660AC2DD1",
+                            "appium:shouldTerminateApp": False,
+                            "appium:forceAppLaunch": False,
+                            "appium:newCommandTimeout": 300
                         }
                     }
-                    
-                    async with session.post(f"{remote_url}/session", json=session_payload) as resp:
-                        if resp.status == 200:
-                            session_data = await resp.json()
-                            session_id = session_data["value"]["sessionId"]
+                }
+                
+                async with session.post(f"{remote_url}/session", json=session_payload) as resp:
+                    if resp.status == 200:
+                        session_data = await resp.json()
+                        session_id = session_data["value"]["sessionId"]
+                        
+                        try:
+                            # Find element by accessibility ID or text
+                            element_found = False
+                            element_id = None
                             
-                            try:
-                                # Find element by accessibility ID or text
-                                element_found = False
-                                element_id = None
+                            if accessibility_id:
+                                find_payload = {
+                                    "using": "accessibility id",
+                                    "value": accessibility_id
+                                }
+                                async with session.post(f"{remote_url}/session/{session_id}/element", json=find_payload) as find_resp:
+                                    if find_resp.status == 200:
+                                        find_data = await find_resp.json()
+                                        element_id = find_data["value"]["ELEMENT"] if "ELEMENT" in find_data["value"] else find_data["value"]["element-6066-11e4-a52e-4f735466cecf"]
+                                        element_found = True
+                                    else:
+                                        error_text = await find_resp.text()
+                                        raise Exception(f"Element not found by accessibility_id: {find_resp.status} - {error_text}")
+                                        
+                            elif element_text:
+                                # Try multiple strategies to find elements
+                                find_strategies = [
+                                    # First try accessibility ID (most reliable)
+                                    {"using": "accessibility id", "value": element_text},
+                                    # Then try by name attribute
+                                    {"using": "name", "value": element_text},
+                                    # Then try by partial text match
+                                    {"using": "xpath", "value": f"//*[contains(@name, '{element_text}') or contains(@label, '{element_text}')]"},
+                                    # Finally try by button text
+                                    {"using": "xpath", "value": f"//XCUIElementTypeButton[contains(@name, '{element_text}')]"}
+                                ]
                                 
-                                if accessibility_id:
-                                    find_payload = {
-                                        "using": "accessibility id",
-                                        "value": accessibility_id
-                                    }
+                                for strategy in find_strategies:
+                                    find_payload = strategy
                                     async with session.post(f"{remote_url}/session/{session_id}/element", json=find_payload) as find_resp:
                                         if find_resp.status == 200:
                                             find_data = await find_resp.json()
                                             element_id = find_data["value"]["ELEMENT"] if "ELEMENT" in find_data["value"] else find_data["value"]["element-6066-11e4-a52e-4f735466cecf"]
                                             element_found = True
-                                        else:
-                                            error_text = await find_resp.text()
-                                            raise Exception(f"Element not found by accessibility_id: {find_resp.status} - {error_text}")
-                                            
-                                elif element_text:
-                                    # Try multiple strategies to find elements
-                                    find_strategies = [
-                                        # First try accessibility ID (most reliable)
-                                        {"using": "accessibility id", "value": element_text},
-                                        # Then try by name attribute
-                                        {"using": "name", "value": element_text},
-                                        # Then try by partial text match
-                                        {"using": "xpath", "value": f"//*[contains(@name, '{element_text}') or contains(@label, '{element_text}')]"},
-                                        # Finally try by button text
-                                        {"using": "xpath", "value": f"//XCUIElementTypeButton[contains(@name, '{element_text}')]"}
-                                    ]
-                                    
-                                    for strategy in find_strategies:
-                                        find_payload = strategy
-                                        async with session.post(f"{remote_url}/session/{session_id}/element", json=find_payload) as find_resp:
-                                            if find_resp.status == 200:
-                                                find_data = await find_resp.json()
-                                                element_id = find_data["value"]["ELEMENT"] if "ELEMENT" in find_data["value"] else find_data["value"]["element-6066-11e4-a52e-4f735466cecf"]
-                                                element_found = True
-                                                break
-                                    
-                                    if not element_found:
-                                        raise Exception(f"Element not found with any strategy: {element_text}")
-                                else:
-                                    raise Exception("Either accessibility_id or element_text must be provided")
+                                            break
                                 
                                 if not element_found:
-                                    raise Exception("Element could not be located")
-                                
-                                # Tap the element
-                                async with session.post(f"{remote_url}/session/{session_id}/element/{element_id}/click") as tap_resp:
-                                    if tap_resp.status == 200:
-                                        logger.info(f"✅ Remote find and tap successful: {accessibility_id or element_text}")
-                                        
-                                        # Dismiss modal/screen if requested
-                                        if dismiss_after_screenshot:
-                                            try:
-                                                logger.info("🔙 Attempting to dismiss modal/screen...")
-                                                dismiss_success = False
-                                                
-                                                # Define dismiss button texts to try
-                                                dismiss_texts = []
-                                                if dismiss_button_text:
-                                                    dismiss_texts.append(dismiss_button_text)
-                                                else:
-                                                    # Common dismiss button texts
-                                                    dismiss_texts = ["Done", "Cancel", "Close", "Back", "Dismiss", "OK"]
-                                                
-                                                # Try to find and tap dismiss buttons
-                                                for dismiss_text in dismiss_texts:
-                                                    try:
-                                                        # Try multiple selectors for dismiss button
-                                                        selectors = [
-                                                            {"using": "name", "value": dismiss_text},
-                                                            {"using": "xpath", "value": f"//XCUIElementTypeButton[@name='{dismiss_text}']"},
-                                                            {"using": "xpath", "value": f"//*[contains(@name, '{dismiss_text}')]"},
-                                                            {"using": "accessibility id", "value": dismiss_text}
-                                                        ]
-                                                        
-                                                        for selector in selectors:
-                                                            try:
-                                                                async with session.post(f"{remote_url}/session/{session_id}/element", json=selector) as dismiss_resp:
-                                                                    if dismiss_resp.status == 200:
-                                                                        dismiss_data = await dismiss_resp.json()
-                                                                        dismiss_id = dismiss_data["value"]["ELEMENT"] if "ELEMENT" in dismiss_data["value"] else dismiss_data["value"]["element-6066-11e4-a52e-4f735466cecf"]
-                                                                        await session.post(f"{remote_url}/session/{session_id}/element/{dismiss_id}/click")
-                                                                        logger.info(f"✅ Dismissed using '{dismiss_text}' button")
-                                                                        dismiss_success = True
-                                                                        break
-                                                            except Exception:
-                                                                continue
+                                    raise Exception(f"Element not found with any strategy: {element_text}")
+                            else:
+                                raise Exception("Either accessibility_id or element_text must be provided")
+                            
+                            if not element_found:
+                                raise Exception("Element could not be located")
+                            
+                            # Tap the element
+                            async with session.post(f"{remote_url}/session/{session_id}/element/{element_id}/click") as tap_resp:
+                                if tap_resp.status == 200:
+                                    logger.info(f"✅ Remote find and tap successful: {accessibility_id or element_text}")
+                                    
+                                    # Dismiss modal/screen if requested
+                                    if dismiss_after_screenshot:
+                                        try:
+                                            logger.info("🔙 Attempting to dismiss modal/screen...")
+                                            dismiss_success = False
+                                            
+                                            # Define dismiss button texts to try
+                                            dismiss_texts = []
+                                            if dismiss_button_text:
+                                                dismiss_texts.append(dismiss_button_text)
+                                            else:
+                                                # Common dismiss button texts
+                                                dismiss_texts = ["Done", "Cancel", "Close", "Back", "Dismiss", "OK"]
+                                            
+                                            # Try to find and tap dismiss buttons
+                                            for dismiss_text in dismiss_texts:
+                                                try:
+                                                    # Try multiple selectors for dismiss button
+                                                    selectors = [
+                                                        {"using": "name", "value": dismiss_text},
+                                                        {"using": "xpath", "value": f"//XCUIElementTypeButton[@name='{dismiss_text}']"},
+                                                        {"using": "xpath", "value": f"//*[contains(@name, '{dismiss_text}')]"},
+                                                        {"using": "accessibility id", "value": dismiss_text}
+                                                    ]
+                                                    
+                                                    for selector in selectors:
+                                                        try:
+                                                            async with session.post(f"{remote_url}/session/{session_id}/element", json=selector) as dismiss_resp:
+                                                                if dismiss_resp.status == 200:
+                                                                    dismiss_data = await dismiss_resp.json()
+                                                                    dismiss_id = dismiss_data["value"]["ELEMENT"] if "ELEMENT" in dismiss_data["value"] else dismiss_data["value"]["element-6066-11e4-a52e-4f735466cecf"]
+                                                                    async with session.post(f"{remote_url}/session/{session_id}/element/{dismiss_id}/click"):
+                                                                        pass  # release the pooled connection
+                                                                    logger.info(f"✅ Dismissed using '{dismiss_text}' button")
+                                                                    dismiss_success = True
+                                                                    break
+                                                        except Exception:
+                                                            continue
+                                                    
+                                                    if dismiss_success:
+                                                        break
                                                         
-                                                        if dismiss_success:
-                                                            break
+                                                except Exception:
+                                                    continue
+                                            
+                                            # If no specific dismiss button found, try navigation bar back button
+                                            if not dismiss_success:
+                                                try:
+                                                    # Try common navigation patterns
+                                                    nav_selectors = [
+                                                        {"using": "xpath", "value": "//XCUIElementTypeNavigationBar//XCUIElementTypeButton[1]"},  # First button in nav bar
+                                                        {"using": "xpath", "value": "//XCUIElementTypeButton[@name='Back']"},
+                                                        {"using": "xpath", "value": "//*[@name='chevron.left']"},  # iOS back chevron
+                                                        {"using": "xpath", "value": "//XCUIElementTypeButton[contains(@name, 'back')]"}
+                                                    ]
+                                                    
+                                                    for selector in nav_selectors:
+                                                        try:
+                                                            async with session.post(f"{remote_url}/session/{session_id}/element", json=selector) as nav_resp:
+                                                                if nav_resp.status == 200:
+                                                                    nav_data = await nav_resp.json()
+                                                                    nav_id = nav_data["value"]["ELEMENT"] if "ELEMENT" in nav_data["value"] else nav_data["value"]["element-6066-11e4-a52e-4f735466cecf"]
+                                                                    async with session.post(f"{remote_url}/session/{session_id}/element/{nav_id}/click"):
+                                                                        pass  # release the pooled connection
+                                                                    logger.info("✅ Dismissed using navigation back button")
+                                                                    dismiss_success = True
+                                                                    break
+                                                        except Exception:
+                                                            continue
                                                             
-                                                    except Exception:
-                                                        continue
-                                                
-                                                # If no specific dismiss button found, try navigation bar back button
-                                                if not dismiss_success:
-                                                    try:
-                                                        # Try common navigation patterns
-                                                        nav_selectors = [
-                                                            {"using": "xpath", "value": "//XCUIElementTypeNavigationBar//XCUIElementTypeButton[1]"},  # First button in nav bar
-                                                            {"using": "xpath", "value": "//XCUIElementTypeButton[@name='Back']"},
-                                                            {"using": "xpath", "value": "//*[@name='chevron.left']"},  # iOS back chevron
-                                                            {"using": "xpath", "value": "//XCUIElementTypeButton[contains(@name, 'back')]"}
-                                                        ]
-                                                        
-                                                        for selector in nav_selectors:
-                                                            try:
-                                                                async with session.post(f"{remote_url}/session/{session_id}/element", json=selector) as nav_resp:
-                                                                    if nav_resp.status == 200:
-                                                                        nav_data = await nav_resp.json()
-                                                                        nav_id = nav_data["value"]["ELEMENT"] if "ELEMENT" in nav_data["value"] else nav_data["value"]["element-6066-11e4-a52e-4f735466cecf"]
-                                                                        await session.post(f"{remote_url}/session/{session_id}/element/{nav_id}/click")
-                                                                        logger.info("✅ Dismissed using navigation back button")
-                                                                        dismiss_success = True
-                                                                        break
-                                                            except Exception:
-                                                                continue
-                                                                
-                                                    except Exception:
-                                                        pass
+                                                except Exception:
+                                                    pass
+                                            
+                                            if not dismiss_success:
+                                                logger.warning("⚠️ Could not find dismiss button - modal may still be open")
                                                 
-                                                if not dismiss_success:
-                                                    logger.warning("⚠️ Could not find dismiss button - modal may still be open")
-                                                    
-                                            except Exception as dismiss_e:
-                                                logger.warning(f"⚠️ Dismiss failed: {dismiss_e}")
-                                        
-                                        return {
-                                            "success": True,
-                                            "element": accessibility_id or element_text,
-                                            "session_id": session_id,
-                                            "timestamp": datetime.now().isoformat()
-                                        }
-                                    else:
-                                        error_text = await tap_resp.text()
-                                        raise Exception(f"Tap failed: {tap_resp.status} - {error_text}")
-                                        
-                            finally:
-                                # Clean up session
-                                await session.delete(f"{remote_url}/session/{session_id}")
-                        else:
-                            error_text = await resp.text()
-                            raise Exception(f"Session creation failed: {resp.status} - {error_text}")
+                                        except Exception as dismiss_e:
+                                            logger.warning(f"⚠️ Dismiss failed: {dismiss_e}")
+                                    
+                                    return {
+                                        "success": True,
+                                        "element": accessibility_id or element_text,
+                                        "session_id": session_id,
+                                        "timestamp": _now_iso()
+                                    }
+                                else:
+                                    error_text = await tap_resp.text()
+                                    raise Exception(f"Tap failed: {tap_resp.status} - {error_text}")
+                                    
+                        finally:
+                            # Clean up session
+                            async with session.delete(f"{remote_url}/session/{session_id}"):
+                                pass  # release the pooled connection
+                    else:
+                        error_text = await resp.text()
+                        raise Exception(f"Session creation failed: {resp.status} - {error_text}")
                 
             except Exception as e:
                 logger.error(f"❌ Remote find and tap error: {e}")
@@ -948,6 +1395,26 @@ else:
     logger.info(f"🔗 Remote iOS host: {os.getenv('REMOTE_IOS_HOST', 'localhost')}:{os.getenv('REMOTE_IOS_PORT', '4723')}")
 
 
+def _resolve_event_loop(requested: str) -> str:
+    """
+    Map the configured event loop (MCP_EVENT_LOOP) to a uvicorn loop setting.
+    
+    Args:
+        requested: "auto", "uvloop" or "asyncio"
+        
+    Returns:
+        The loop setting to pass to uvicorn
+    """
+    if requested not in ("auto", "uvloop", "asyncio"):
+        logger.warning(f"Invalid MCP_EVENT_LOOP value: '{requested}'. Defaulting to auto.")
+        return "auto"
+    
+    if requested == "uvloop" and importlib.util.find_spec("uvloop") is None:
+        logger.warning("uvloop is not installed (speedups extra); falling back to asyncio")
+        return "asyncio"
+    return requested
+
+
 # __main__ block for local execution
 if __name__ == "__main__":
     def main():
@@ -982,13 +1449,15 @@ if __name__ == "__main__":
             logger.info(f"🌐 Server will listen on {host}:{port}")
         else:
             logger.info("🔧 Local development mode")
-            logger.info("🔧 Available tools: take_screenshot, launch_app, find_and_tap, appium_tap_and_type, list_simulators")
+            logger.info(f"🔧 Available tools: {', '.join(_TOOL_NAMES)}")
         
         # Run the server
         try:
             import uvicorn
+            event_loop = _resolve_event_loop(settings.server.event_loop)
+            logger.info(f"🔁 Event loop: {event_loop}")
             logger.info(f"🚀 Starting server on http://{host}:{port}")
-            uvicorn.run(app, host=host, port=port, log_level="info")
+            uvicorn.run(app, host=host, port=port, log_level="info", loop=event_loop)
         except KeyboardInterrupt:
             logger.info("\n⏹️ FastMCP server stopped by user")
         except Exception as e:
@@ -9,11 +9,12 @@ This package contains the core automation services for iOS platform:
 
 from .appium_client import AppiumClient
 from .screenshot_service import ScreenshotService
-from .simulator_manager import SimulatorManager
+from .simulator_manager import SimulatorManager, get_simulator_manager
 
 __version__ = "2.0.0"
 __all__ = [
     "AppiumClient",
     "ScreenshotService", 
-    "SimulatorManager"
+    "SimulatorManager",
+    "get_simulator_manager"
 ]
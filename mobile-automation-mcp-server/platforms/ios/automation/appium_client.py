@@ -6,24 +6,31 @@ handling connection management, script generation, and execution.
 """
 
 import os
-import sys
 import asyncio
 import tempfile
 from pathlib import Path
 from typing import Dict, Any, Optional
 from datetime import datetime
 
-# Add the parent directory to sys.path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
-
 import aiohttp
 
 from config.settings import settings
 from shared.utils.logger import get_logger
+from shared.utils.http_session import get_http_session
 from shared.utils.exceptions import AppiumConnectionError, AutomationError
 
 logger = get_logger(__name__)
 
+# Single-pass escape table for embedding user text in a generated
+# double-quoted Python string literal
+_PY_STRING_ESCAPE = str.maketrans({
+    "\\": "\\\\",
+    '"': '\\"',
+    "'": "\\'",
+    "\n": "\\n",
+    "\r": "\\r",
+})
+
 
 class AppiumClient:
     """
@@ -33,17 +40,37 @@ class AppiumClient:
     solely on Appium automation operations.
     """
     
-    def __init__(self, appium_url: Optional[str] = None):
+    def __init__(
+        self,
+        appium_url: Optional[str] = None,
+        http_session: Optional[aiohttp.ClientSession] = None
+    ):
         """
         Initialize the Appium client.
         
         Args:
             appium_url: Override for Appium server URL (uses config default if None)
+            http_session: HTTP session to use (uses the shared pooled session if None)
         """
         self.appium_url = appium_url or settings.appium.url
+        self._http_session = http_session
         self.session_active = False
         self.logger = get_logger(__name__)
     
+    @property
+    def http(self) -> aiohttp.ClientSession:
+        """Get the HTTP session used for Appium requests."""
+        return self._http_session or get_http_session()
+    
+    async def __aenter__(self) -> "AppiumClient":
+        """Connect to the Appium server for the duration of an async with block."""
+        await self.start_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """Release the Appium session on leaving the async with block."""
+        await self.close_session()
+    
     async def start_session(self) -> None:
         """
         Initialize connection to Appium server.
@@ -55,18 +82,17 @@ class AppiumClient:
             AppiumConnectionError: If unable to connect to Appium server
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.appium_url}/status") as response:
-                    if response.status == 200:
-                        status_data = await response.json()
-                        self.logger.info(f"✅ Connected to Appium server: {self.appium_url}")
-                        self.logger.debug(f"🔍 Appium status: {status_data}")
-                        self.session_active = True
-                    else:
-                        raise AppiumConnectionError(
-                            f"Appium server returned status {response.status}",
-                            context={"url": self.appium_url, "status": response.status}
-                        )
+            async with self.http.get(f"{self.appium_url}/status") as response:
+                if response.status == 200:
+                    status_data = await response.json()
+                    self.logger.info(f"✅ Connected to Appium server: {self.appium_url}")
+                    self.logger.debug(f"🔍 Appium status: {status_data}")
+                    self.session_active = True
+                else:
+                    raise AppiumConnectionError(
+                        f"Appium server returned status {response.status}",
+                        context={"url": self.appium_url, "status": response.status}
+                    )
         except aiohttp.ClientError as e:
             raise AppiumConnectionError(
                 f"Failed to connect to Appium server at {self.appium_url}",
@@ -82,6 +108,26 @@ class AppiumClient:
                 context={"url": self.appium_url, "error_type": type(e).__name__}
             )
     
+    async def ping(self, timeout: float = 2.0) -> bool:
+        """
+        Check whether the Appium server answers its /status endpoint.
+        
+        Unlike start_session(), this never raises and does not change
+        session state, so it is cheap enough for status probes.
+        
+        Args:
+            timeout: Maximum time to wait for the server in seconds
+            
+        Returns:
+            True if the server responded with HTTP 200
+        """
+        try:
+            client_timeout = aiohttp.ClientTimeout(total=timeout)
+            async with self.http.get(f"{self.appium_url}/status", timeout=client_timeout) as response:
+                return response.status == 200
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return False
+    
     async def close_session(self) -> None:
         """
         Clean up Appium session resources.
@@ -210,10 +256,7 @@ class AppiumClient:
         """
         
         # Escape text for Python string literals
-        escaped_text = text.replace('\\', '\\\\').replace('"', '\\"').replace("'", "\\'")
-        
-        # Import settings for configuration
-        from config.settings import settings
+        escaped_text = text.translate(_PY_STRING_ESCAPE)
         
         # Generate the automation script with proper error handling
         script = f'''
@@ -292,7 +335,7 @@ def main():
         # Small delay to ensure field is focused
         time.sleep(0.5)
         
-        print(f"Typing text: '{escaped_text}'")
+        print("Typing text: '{escaped_text}'")
         text_field.send_keys("{escaped_text}")
         
         # Take screenshot as proof of success
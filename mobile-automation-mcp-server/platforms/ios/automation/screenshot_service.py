@@ -6,22 +6,30 @@ with proper error handling and file management.
 """
 
 import os
-import sys
+import shutil
 import asyncio
+import base64
+import time
+import uuid
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Awaitable, Callable, Hashable, List, Literal, Set, Tuple
 from datetime import datetime
 
-# Add the parent directory to sys.path for direct execution
-if __name__ == "__main__":
-    sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
-
-from shared.utils.command_runner import run_command
 from shared.utils.logger import get_logger
-from shared.utils.exceptions import ScreenshotError
+from shared.utils.command_runner import CommandRunner, default_runner
+from shared.utils.exceptions import AutomationMCPError, ScreenshotError
 
 logger = get_logger(__name__)
 
+# Maximum concurrent simctl captures for burst sequences (interval == 0)
+BURST_CONCURRENCY = 4
+
+# Above this many files, cleanup moves them to a staging dir and removes it in the background
+STAGED_DELETE_THRESHOLD = 16
+
+# How long a capture may be reused for an unchanged simulator state token
+SCREENSHOT_CACHE_TTL = 2.0
+
 
 class ScreenshotService:
     """
@@ -31,13 +39,25 @@ class ScreenshotService:
     solely on screenshot-related operations.
     """
     
-    def __init__(self, default_directory: Optional[str] = None):
+    logger = get_logger(__name__)
+    
+    # Strong references to background removal tasks so they are not garbage collected
+    _background_tasks: Set[asyncio.Task] = set()
+    
+    def __init__(
+        self,
+        default_directory: Optional[str] = None,
+        command_runner: Optional[CommandRunner] = None
+    ):
         """
         Initialize the screenshot service.
         
         Args:
             default_directory: Default directory for saving screenshots
+            command_runner: Runner for simctl commands (uses the shared default if None)
         """
+        self.command_runner = command_runner or default_runner
+        
         if default_directory:
             self.default_directory = Path(default_directory)
         else:
@@ -46,24 +66,111 @@ class ScreenshotService:
             project_root = Path(__file__).parent.parent
             self.default_directory = project_root / "screenshots"
         
-        self.logger = get_logger(__name__)
-        
         # Ensure default directory exists
         self.default_directory.mkdir(parents=True, exist_ok=True)
+        
+        # Last capture per (device, directory): (state token, monotonic time, result)
+        self._last_capture: Dict[Tuple[str, Optional[str]], Tuple[Hashable, float, Dict[str, Any]]] = {}
+        
+        # Captures in progress, shared by concurrent identical requests
+        self._inflight: Dict[Tuple[Hashable, ...], asyncio.Future] = {}
     
     async def take_screenshot(
         self, 
         filename: Optional[str] = None,
         device_id: str = "booted",
-        directory: Optional[str] = None
+        directory: Optional[str] = None,
+        state_token: Optional[Hashable] = None,
+        sink: Literal["file", "memory"] = "file"
     ) -> Dict[str, Any]:
         """
         Take a screenshot of the specified iOS simulator.
         
+        When a state token is given and no filename is requested, a capture
+        taken for the same device, directory and token within
+        SCREENSHOT_CACHE_TTL is returned instead of grabbing a new one.
+        Concurrent requests without a filename for the same device, directory
+        and token share a single capture.
+        
         Args:
             filename: Name for the screenshot file (auto-generated if None)
             device_id: The simulator UDID (defaults to "booted")
             directory: Directory to save the screenshot (uses default if None)
+            state_token: Fingerprint of the simulator state (no reuse if None)
+            sink: "file" to save a PNG file, "memory" to return base64 PNG data
+                without touching the disk (filename, directory and
+                state_token are ignored)
+            
+        Returns:
+            Dictionary with screenshot information and file path, or with
+            the base64 payload in "png_b64" for the memory sink
+            
+        Raises:
+            ScreenshotError: If unable to take or save the screenshot
+        """
+        
+        if sink == "memory":
+            return await self._single_flight(
+                ("memory", device_id),
+                lambda: self._take_screenshot_to_memory(device_id)
+            )
+        
+        if filename:
+            # An explicit filename is always a fresh capture of its own
+            return await self._save_screenshot(filename, device_id, directory, state_token)
+        
+        if state_token is not None:
+            cached = self._reuse_capture((device_id, directory), state_token)
+            if cached is not None:
+                return cached
+        
+        return await self._single_flight(
+            ("file", device_id, directory, state_token),
+            lambda: self._save_screenshot(None, device_id, directory, state_token)
+        )
+    
+    async def _single_flight(
+        self,
+        key: Tuple[Hashable, ...],
+        capture: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """
+        Run a capture, sharing it with concurrent callers using the same key.
+        
+        Args:
+            key: Identifies requests that may be served by the same capture
+            capture: Starts the capture when none is in flight for the key
+            
+        Returns:
+            Copy of the capture result for this caller
+        """
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(capture())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _task: self._inflight.pop(key, None))
+        else:
+            self.logger.debug(f"🔗 Joining in-flight screenshot for {key}")
+        
+        # Shield so one cancelled caller does not cancel the shared capture
+        return dict(await asyncio.shield(task))
+    
+    async def _save_screenshot(
+        self,
+        filename: Optional[str],
+        device_id: str,
+        directory: Optional[str],
+        state_token: Optional[Hashable]
+    ) -> Dict[str, Any]:
+        """
+        Capture a screenshot and save it as a PNG file.
+        
+        Args:
+            filename: Name for the screenshot file (auto-generated if None)
+            device_id: The simulator UDID
+            directory: Directory to save the screenshot (uses default if None)
+            state_token: Simulator state fingerprint to record with the capture
             
         Returns:
             Dictionary with screenshot information and file path
@@ -72,13 +179,18 @@ class ScreenshotService:
             ScreenshotError: If unable to take or save the screenshot
         """
         
+        cache_key = (device_id, directory)
+        
+        # Single wallclock read for both the filename and the result timestamp
+        now = datetime.now()
+        
         # Determine save directory
         save_dir = Path(directory) if directory else self.default_directory
         save_dir.mkdir(parents=True, exist_ok=True)
         
         # Generate filename if not provided
         if not filename:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
             filename = f"ios_screenshot_{timestamp}.png"
         
         # Ensure filename has .png extension
@@ -92,41 +204,43 @@ class ScreenshotService:
         self.logger.debug(f"💾 Save path: {screenshot_path}")
         
         try:
-            # Take screenshot using simctl
-            output, success = await run_command([
-                "xcrun", "simctl", "io", device_id, "screenshot", str(screenshot_path)
-            ])
+            # Capture PNG bytes from simctl stdout and write them ourselves;
+            # the byte count comes from the capture, so no stat is needed
+            png_data, output, success = await self._capture_png(device_id)
             
-            if success and screenshot_path.exists():
-                # Get file size for verification
-                file_size = screenshot_path.stat().st_size
-                
+            file_size = len(png_data)
+            file_exists = file_size > 0
+            if file_exists:
+                await asyncio.to_thread(screenshot_path.write_bytes, png_data)
+            
+            if success and file_exists:
                 self.logger.info(f"✅ Screenshot saved successfully: {screenshot_path}")
                 self.logger.debug(f"📊 File size: {file_size:,} bytes")
                 
-                return {
+                result = {
                     "success": True,
                     "filename": filename,
                     "path": str(screenshot_path),
                     "size_bytes": file_size,
                     "device_id": device_id,
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": now.isoformat()
                 }
+                if state_token is not None:
+                    self._last_capture[cache_key] = (state_token, time.monotonic(), result)
+                return dict(result)
             else:
                 # Check if file was created but command reported failure
-                if screenshot_path.exists():
-                    file_size = screenshot_path.stat().st_size
-                    if file_size > 0:
-                        self.logger.warning(f"⚠️ Screenshot saved but command reported failure: {output}")
-                        return {
-                            "success": True,
-                            "filename": filename,
-                            "path": str(screenshot_path),
-                            "size_bytes": file_size,
-                            "device_id": device_id,
-                            "timestamp": datetime.now().isoformat(),
-                            "warning": "Command reported failure but file was created"
-                        }
+                if file_size > 0:
+                    self.logger.warning(f"⚠️ Screenshot saved but command reported failure: {output}")
+                    return {
+                        "success": True,
+                        "filename": filename,
+                        "path": str(screenshot_path),
+                        "size_bytes": file_size,
+                        "device_id": device_id,
+                        "timestamp": now.isoformat(),
+                        "warning": "Command reported failure but file was created"
+                    }
                 
                 raise ScreenshotError(
                     f"Failed to take screenshot of device {device_id}",
@@ -134,7 +248,7 @@ class ScreenshotService:
                         "device_id": device_id,
                         "save_path": str(screenshot_path),
                         "command_output": output,
-                        "file_exists": screenshot_path.exists(),
+                        "file_exists": file_exists,
                         "suggestions": [
                             "Check if simulator is booted and accessible",
                             "Verify device ID is correct",
@@ -148,12 +262,11 @@ class ScreenshotService:
                 raise
             
             # Clean up partial file if it exists
-            if screenshot_path.exists():
-                try:
-                    screenshot_path.unlink()
-                    self.logger.debug(f"🗑️ Cleaned up partial screenshot file: {screenshot_path}")
-                except:
-                    pass
+            try:
+                screenshot_path.unlink()
+                self.logger.debug(f"🗑️ Cleaned up partial screenshot file: {screenshot_path}")
+            except OSError:
+                pass
             
             raise ScreenshotError(
                 f"Unexpected error taking screenshot: {str(e)}",
@@ -164,6 +277,127 @@ class ScreenshotService:
                 }
             )
     
+    async def _take_screenshot_to_memory(self, device_id: str) -> Dict[str, Any]:
+        """
+        Take a screenshot and return it base64-encoded instead of saving it.
+        
+        Args:
+            device_id: The simulator UDID (or "booted")
+            
+        Returns:
+            Dictionary with the base64 PNG payload and screenshot information
+            
+        Raises:
+            ScreenshotError: If unable to take the screenshot
+        """
+        
+        now = datetime.now()
+        self.logger.info(f"📸 Taking in-memory screenshot of device: {device_id}")
+        
+        try:
+            png_data, output, success = await self._capture_png(device_id)
+        except ScreenshotError:
+            raise
+        except Exception as e:
+            raise ScreenshotError(
+                f"Unexpected error taking screenshot: {str(e)}",
+                context={"device_id": device_id, "error_type": type(e).__name__}
+            )
+        
+        if not png_data:
+            raise ScreenshotError(
+                f"Failed to take screenshot of device {device_id}",
+                context={
+                    "device_id": device_id,
+                    "command_output": output,
+                    "suggestions": [
+                        "Check if simulator is booted and accessible",
+                        "Verify device ID is correct"
+                    ]
+                }
+            )
+        
+        if not success:
+            self.logger.warning(f"⚠️ Screenshot captured but command reported failure: {output}")
+        
+        self.logger.debug(f"📊 Captured {len(png_data):,} bytes in memory")
+        return {
+            "success": True,
+            "png_b64": base64.b64encode(png_data).decode("ascii"),
+            "size_bytes": len(png_data),
+            "device_id": device_id,
+            "timestamp": now.isoformat()
+        }
+    
+    def _reuse_capture(
+        self,
+        cache_key: Tuple[str, Optional[str]],
+        state_token: Hashable
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Look up a recent capture for an unchanged simulator state.
+        
+        Args:
+            cache_key: (device_id, directory) the capture was taken for
+            state_token: Fingerprint the caller expects the capture to match
+            
+        Returns:
+            Copy of the earlier result marked as cached, or None on a miss
+        """
+        
+        entry = self._last_capture.get(cache_key)
+        if entry is None:
+            return None
+        
+        token, captured_at, result = entry
+        if token != state_token or time.monotonic() - captured_at >= SCREENSHOT_CACHE_TTL:
+            return None
+        
+        # The file may have been cleaned up since it was captured
+        if not os.path.exists(result["path"]):
+            del self._last_capture[cache_key]
+            return None
+        
+        self.logger.debug(f"♻️ Reusing screenshot for unchanged state: {result['path']}")
+        return {**result, "cached": True}
+    
+    async def _capture_png(
+        self,
+        device_id: str,
+        timeout: float = 30.0
+    ) -> Tuple[bytes, str, bool]:
+        """
+        Capture a screenshot as PNG bytes via simctl's stdout.
+        
+        Args:
+            device_id: The simulator UDID (or "booted")
+            timeout: Maximum time to wait for simctl in seconds
+            
+        Returns:
+            Tuple of (PNG bytes, stderr text, success boolean)
+            
+        Raises:
+            ScreenshotError: If simctl cannot be run or times out
+        """
+        
+        try:
+            # simctl needs no inherited fds or session of its own, which lets
+            # CPython spawn it via posix_spawn
+            result = await self.command_runner.run(
+                ["xcrun", "simctl", "io", device_id, "screenshot", "--type=png", "-"],
+                timeout=timeout,
+                decode=False,
+                close_fds=False,
+                start_new_session=False
+            )
+        except AutomationMCPError as e:
+            raise ScreenshotError(
+                f"Screenshot capture failed: {e.message}",
+                context={"device_id": device_id, **e.context}
+            )
+        
+        return result.stdout, result.stderr.decode("utf-8", errors="replace"), result.success
+    
     async def take_multiple_screenshots(
         self,
         count: int,
@@ -204,6 +438,37 @@ class ScreenshotService:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         try:
+            if interval_seconds == 0 and count > 1:
+                # No interval requested: overlap simctl spawns with bounded concurrency
+                sem = asyncio.Semaphore(BURST_CONCURRENCY)
+                tasks = [
+                    asyncio.ensure_future(self._take_sequence_item(
+                        sem,
+                        f"{prefix}_{timestamp}_{i+1:03d}.png",
+                        i + 1,
+                        count,
+                        device_id,
+                        directory
+                    ))
+                    for i in range(count)
+                ]
+                try:
+                    await asyncio.gather(*tasks)
+                finally:
+                    # If a capture failed, stop the rest of the burst and reap it,
+                    # so no capture keeps writing files after the error is reported
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+                    screenshots = [
+                        task.result()
+                        for task in tasks
+                        if not task.cancelled() and task.exception() is None
+                    ]
+                
+                self.logger.info(f"✅ Successfully captured {len(screenshots)} screenshots")
+                return screenshots
+            
             for i in range(count):
                 # Generate sequential filename
                 filename = f"{prefix}_{timestamp}_{i+1:03d}.png"
@@ -230,6 +495,7 @@ class ScreenshotService:
             
         except Exception as e:
             if isinstance(e, ScreenshotError):
+                e.context.setdefault("completed", len(screenshots))
                 raise
             
             raise ScreenshotError(
@@ -243,6 +509,142 @@ class ScreenshotService:
                 }
             )
     
+    async def _take_sequence_item(
+        self,
+        sem: asyncio.Semaphore,
+        filename: str,
+        sequence_number: int,
+        total_count: int,
+        device_id: str,
+        directory: Optional[str]
+    ) -> Dict[str, Any]:
+        """
+        Take one screenshot of a burst sequence under a concurrency limit.
+        
+        Args:
+            sem: Semaphore bounding concurrent simctl invocations
+            filename: Filename for this screenshot
+            sequence_number: 1-based position in the sequence
+            total_count: Total number of screenshots in the sequence
+            device_id: The simulator UDID
+            directory: Directory to save the screenshot
+            
+        Returns:
+            Screenshot information with sequence metadata
+        """
+        
+        async with sem:
+            result = await self.take_screenshot(
+                filename=filename,
+                device_id=device_id,
+                directory=directory
+            )
+        
+        result["sequence_number"] = sequence_number
+        result["total_count"] = total_count
+        self.logger.debug(f"📸 Screenshot {sequence_number}/{total_count} completed")
+        return result
+    
+    def _scan_png_files(self, search_dir: Path) -> List[Tuple[os.DirEntry, os.stat_result]]:
+        """
+        Collect PNG files in a directory together with their stat results.
+        
+        Uses a single os.scandir pass so each file costs one stat call.
+        
+        Args:
+            search_dir: Directory to scan
+            
+        Returns:
+            List of (directory entry, stat result) tuples
+        """
+        
+        png_files = []
+        with os.scandir(search_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".png"):
+                    continue
+                try:
+                    if entry.is_file():
+                        png_files.append((entry, entry.stat()))
+                except OSError as e:
+                    self.logger.warning(f"⚠️ Error reading file info for {entry.path}: {e}")
+        return png_files
+    
+    def _delete_batch(self, files: List[Tuple[str, int]]) -> Tuple[int, int]:
+        """
+        Delete a batch of files synchronously.
+        
+        Args:
+            files: List of (path, size in bytes) tuples to delete
+            
+        Returns:
+            Tuple of (deleted count, deleted size in bytes)
+        """
+        
+        deleted_count = 0
+        deleted_size = 0
+        
+        for path, size in files:
+            try:
+                os.unlink(path)
+                deleted_count += 1
+                deleted_size += size
+                self.logger.debug(f"🗑️ Deleted: {os.path.basename(path)}")
+            except Exception as e:
+                self.logger.warning(f"⚠️ Failed to delete {path}: {e}")
+        
+        return deleted_count, deleted_size
+    
+    def _stage_batch(self, files: List[Tuple[str, int]], staging_dir: Path) -> Tuple[int, int, bool]:
+        """
+        Move a batch of files into a staging directory for later removal.
+        
+        Falls back to deleting in place when the staging directory cannot be
+        created, and per file when a rename fails.
+        
+        Args:
+            files: List of (path, size in bytes) tuples to remove
+            staging_dir: Directory to create and move the files into
+            
+        Returns:
+            Tuple of (removed count, removed size in bytes, whether the
+            staging directory was created and still needs removing)
+        """
+        
+        try:
+            os.mkdir(staging_dir)
+        except OSError as e:
+            self.logger.warning(f"⚠️ Could not create staging dir {staging_dir}, deleting in place: {e}")
+            deleted_count, deleted_size = self._delete_batch(files)
+            return deleted_count, deleted_size, False
+        
+        staged_count = 0
+        staged_size = 0
+        leftovers = []
+        
+        for path, size in files:
+            try:
+                os.rename(path, staging_dir / os.path.basename(path))
+                staged_count += 1
+                staged_size += size
+            except OSError as e:
+                self.logger.debug(f"🗑️ Could not stage {path}, deleting in place: {e}")
+                leftovers.append((path, size))
+        
+        if leftovers:
+            deleted_count, deleted_size = self._delete_batch(leftovers)
+            staged_count += deleted_count
+            staged_size += deleted_size
+        
+        self.logger.debug(f"🗑️ Staged {staged_count} files for removal in {staging_dir}")
+        return staged_count, staged_size, True
+    
+    def _on_staged_removal_done(self, task: asyncio.Task) -> None:
+        """Forget a finished staging-dir removal task and log its failure, if any."""
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.warning(f"⚠️ Failed to remove staged screenshots: {task.exception()}")
+    
     def list_screenshots(self, directory: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         List all screenshot files in the specified directory.
@@ -264,19 +666,15 @@ class ScreenshotService:
         
         screenshots = []
         
-        # Find all PNG files in the directory
-        for png_file in search_dir.glob("*.png"):
-            try:
-                stat = png_file.stat()
-                screenshots.append({
-                    "filename": png_file.name,
-                    "path": str(png_file),
-                    "size_bytes": stat.st_size,
-                    "created": datetime.fromtimestamp(stat.st_ctime).isoformat(),
-                    "modified": datetime.fromtimestamp(stat.st_mtime).isoformat()
-                })
-            except Exception as e:
-                self.logger.warning(f"⚠️ Error reading file info for {png_file}: {e}")
+        # Find all PNG files in the directory (one stat per entry)
+        for entry, stat in self._scan_png_files(search_dir):
+            screenshots.append({
+                "filename": entry.name,
+                "path": entry.path,
+                "size_bytes": stat.st_size,
+                "created": datetime.fromtimestamp(stat.st_ctime).isoformat(),
+                "modified": datetime.fromtimestamp(stat.st_mtime).isoformat()
+            })
         
         # Sort by creation time (newest first)
         screenshots.sort(key=lambda x: x["created"], reverse=True)
@@ -312,26 +710,28 @@ class ScreenshotService:
         self.logger.info(f"🧹 Cleaning up old screenshots, keeping {keep_count} recent files")
         
         # Get all PNG files sorted by modification time (newest first)
-        png_files = list(search_dir.glob("*.png"))
-        png_files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
+        png_files = self._scan_png_files(search_dir)
+        png_files.sort(key=lambda item: item[1].st_mtime, reverse=True)
         
         # Determine which files to delete
         files_to_keep = png_files[:keep_count]
         files_to_delete = png_files[keep_count:]
         
-        deleted_count = 0
-        deleted_size = 0
+        files = [(entry.path, stat.st_size) for entry, stat in files_to_delete]
         
-        # Delete old files
-        for file_path in files_to_delete:
-            try:
-                file_size = file_path.stat().st_size
-                file_path.unlink()
-                deleted_count += 1
-                deleted_size += file_size
-                self.logger.debug(f"🗑️ Deleted: {file_path.name}")
-            except Exception as e:
-                self.logger.warning(f"⚠️ Failed to delete {file_path}: {e}")
+        if len(files) > STAGED_DELETE_THRESHOLD:
+            # Large batch: rename into a staging dir and rmtree it off the response path
+            staging_dir = search_dir / f".trash_{uuid.uuid4().hex}"
+            deleted_count, deleted_size, staged = await asyncio.to_thread(
+                self._stage_batch, files, staging_dir
+            )
+            if staged:
+                task = asyncio.create_task(asyncio.to_thread(shutil.rmtree, staging_dir))
+                self._background_tasks.add(task)
+                task.add_done_callback(self._on_staged_removal_done)
+        else:
+            # Delete old files in one worker thread to keep the event loop free
+            deleted_count, deleted_size = await asyncio.to_thread(self._delete_batch, files)
         
         result = {
             "deleted": deleted_count,
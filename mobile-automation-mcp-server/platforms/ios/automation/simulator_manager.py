@@ -2,21 +2,48 @@
 iOS Simulator manager for automation.
 """
 
-import os
-import sys
+import re
 import json
-from pathlib import Path
-from typing import Dict, Any, Optional, List
-
-# Add the parent directory to sys.path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+import asyncio
+import logging
+import time
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Set, Tuple, Union, Callable, Awaitable
 
 from shared.utils.command_runner import run_command
 from shared.utils.logger import get_logger
 from shared.utils.exceptions import SimulatorError, AppLaunchError
+from config.settings import settings
 
 logger = get_logger(__name__)
 
+# Prefer orjson for parsing simctl's (often large) JSON output when installed
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _JSON_DECODE_ERRORS = (json.JSONDecodeError, orjson.JSONDecodeError)
+except ImportError:
+    _json_loads = json.loads
+    _JSON_DECODE_ERRORS = (json.JSONDecodeError,)
+
+# A non-blank `simctl listapps` line that contains a colon and is not a `=` rule
+# (surrounding whitespace excluded from the captured line)
+_APP_LINE_RE = re.compile(rb"^[ \t]*(?P<line>(?!=)(?=[^\n]*:)\S[^\n]*?)[ \t\r]*$", re.MULTILINE)
+
+# Benign simctl failures: the device is already in the requested state
+_BENIGN_BOOT_RE = re.compile(r"current state:\s*Booted")
+_BENIGN_SHUTDOWN_RE = re.compile(r"current state:\s*Shutdown|No devices are booted")
+
+# Benign `simctl terminate` failure: the app was not running
+_NOT_RUNNING_RE = re.compile(rb"not running|no such process", re.IGNORECASE)
+
+# `simctl launch` prints "<bundle id>: <pid>"
+_LAUNCH_PID_RE = re.compile(r"^\s*([\w.\-]+):\s*(\d+)\s*$", re.MULTILINE)
+
+# Default lifetime of a `simctl list devices` snapshot before re-shelling;
+# boot/shutdown invalidate it explicitly, so it can be generous
+SIMULATOR_LIST_TTL = 30.0
+
 
 class SimulatorManager:
     """
@@ -26,16 +53,260 @@ class SimulatorManager:
     solely on simulator-related operations.
     """
     
-    def __init__(self):
-        """Initialize the simulator manager."""
-        self.logger = get_logger(__name__)
+    __slots__ = (
+        "logger", "max_parallel", "_sim_cache", "_sim_cache_ttl", "_sim_cache_version",
+        "_sim_cache_lock", "_pending_list", "_booted"
+    )
+    
+    _SIMCTL = ("xcrun", "simctl")
+    
+    # Static remediation hints shared by every raise
+    _BOOT_SUGGESTION = "Check if device ID is valid and Xcode is properly installed"
+    _LAUNCH_SUGGESTIONS = (
+        "Check if app is installed on simulator",
+        "Verify bundle ID is correct",
+        "Ensure simulator is booted"
+    )
+    
+    def __init__(
+        self,
+        cache_ttl: float = SIMULATOR_LIST_TTL,
+        max_parallel: Optional[int] = None,
+        logger: logging.Logger = logger
+    ):
+        """
+        Initialize the simulator manager.
+        
+        Args:
+            cache_ttl: Seconds a simulator listing is reused before re-running simctl
+            max_parallel: Concurrency limit for bulk boot/shutdown (defaults to server config)
+            logger: Logger to use (defaults to this module's logger)
+        """
+        self.logger = logger
+        self.max_parallel = max_parallel or settings.server.max_parallel
+        
+        # (timestamp, parsed simctl output) of the last successful listing
+        self._sim_cache: Optional[tuple] = None
+        self._sim_cache_ttl = cache_ttl
+        
+        # Bumped on every cache change so an in-flight listing started before
+        # a boot/shutdown does not overwrite the patched state when it lands
+        self._sim_cache_version = 0
+        self._sim_cache_lock = asyncio.Lock()
+        
+        # In-flight listing shared by concurrent callers on a cold cache
+        self._pending_list: Optional[asyncio.Future] = None
+        
+        # UDIDs known to be booted, refreshed from each listing and kept
+        # current by boot/shutdown so redundant `simctl boot` calls are skipped
+        self._booted: Set[str] = set()
+    
+    def _is_known_booted(self, device_id: str) -> bool:
+        """
+        Check whether a simulator is known to be booted.
+        
+        The booted set is only trusted while the cached listing is fresh, since
+        simulators can be shut down outside this server at any time.
+        
+        Args:
+            device_id: The UDID of the simulator
+            
+        Returns:
+            True if the device was booted as of a listing younger than the TTL
+        """
+        if device_id not in self._booted or self._sim_cache is None:
+            return False
+        
+        cached_at, _listing = self._sim_cache
+        if time.monotonic() - cached_at >= self._sim_cache_ttl:
+            # Expired: forget the set too so it cannot outlive the listing
+            self._booted.clear()
+            return False
+        return True
+    
+    async def _simctl(self, *tail: str, **kwargs) -> Tuple[Union[str, bytes], bool]:
+        """
+        Run an `xcrun simctl` subcommand.
+        
+        simctl gets no stdin and inherits nothing we rely on, so fd closing and
+        session setup are skipped, which lets CPython spawn via posix_spawn.
+        
+        Args:
+            *tail: simctl subcommand and its arguments
+            **kwargs: Additional arguments passed to run_command()
+            
+        Returns:
+            Tuple of (output, success_boolean)
+        """
+        return await run_command(
+            [*self._SIMCTL, *tail],
+            close_fds=False,
+            start_new_session=False,
+            **kwargs
+        )
+    
+    def _invalidate_sim_cache(self) -> None:
+        """Drop the cached simulator listing after a state-changing operation."""
+        self._sim_cache = None
+        self._sim_cache_version += 1
+    
+    async def _record_device_state(self, device_id: str, state: str) -> None:
+        """
+        Patch a device's state in the cached listing instead of discarding it.
+        
+        The patch is copy-on-write: the device's runtime list is rebuilt and
+        swapped in, so listings already handed out never change underneath
+        their holders. Falls back to invalidating the cache when the device is
+        not in it (e.g. the "booted" alias), so the next read re-queries simctl.
+        
+        Args:
+            device_id: UDID of the device whose state changed
+            state: New simctl state ("Booted" or "Shutdown")
+        """
+        async with self._sim_cache_lock:
+            if self._sim_cache is not None:
+                cached_at, listing = self._sim_cache
+                devices_by_runtime = listing.get("devices", {})
+                for runtime, devices in devices_by_runtime.items():
+                    for index, device in enumerate(devices):
+                        if device.get("udid") == device_id:
+                            patched = list(devices)
+                            patched[index] = {**device, "state": state}
+                            self._sim_cache = (
+                                cached_at,
+                                {**listing, "devices": {**devices_by_runtime, runtime: patched}}
+                            )
+                            self._sim_cache_version += 1
+                            return
+            
+            self._invalidate_sim_cache()
     
     async def list_simulators(self) -> Dict[str, Any]:
         """
         List all available iOS simulators with their status.
         
         Returns:
-            Dictionary containing simulator information in JSON format
+            Dictionary containing simulator information in JSON format; the
+            caller owns it, so changing it does not affect the cached listing
+            
+        Raises:
+            SimulatorError: If unable to list simulators
+        """
+        listing = await self._get_listing()
+        # simctl device entries are flat, so copying each one is a full copy
+        return {
+            "devices": {
+                runtime: [dict(device) for device in devices]
+                for runtime, devices in listing.get("devices", {}).items()
+            }
+        }
+    
+    async def list_booted_devices(self) -> List[Dict[str, Any]]:
+        """
+        List only the simulators that are currently booted.
+        
+        Filters the cached listing when it is fresh; otherwise asks simctl for
+        booted devices only, so the full device tree is never parsed.
+        
+        Returns:
+            List of booted device dictionaries, each tagged with its runtime
+            
+        Raises:
+            SimulatorError: If unable to query simctl
+        """
+        devices_by_runtime = None
+        if self._sim_cache is not None:
+            cached_at, listing = self._sim_cache
+            if time.monotonic() - cached_at < self._sim_cache_ttl:
+                devices_by_runtime = listing.get("devices", {})
+        
+        if devices_by_runtime is None:
+            output, success = await self._simctl("list", "devices", "booted", "--json", decode=False)
+            if not success:
+                raise SimulatorError(
+                    "Failed to list booted iOS simulators",
+                    context={"command_output": output.decode("utf-8", errors="replace")}
+                )
+            try:
+                devices_by_runtime = _json_loads(output).get("devices", {})
+            except _JSON_DECODE_ERRORS as e:
+                raise SimulatorError(
+                    "Invalid JSON response from simctl list command",
+                    context={"parse_error": str(e), "output": output[:500].decode("utf-8", errors="replace")}
+                )
+        
+        return [
+            {**device, "runtime": runtime}
+            for runtime, devices in devices_by_runtime.items()
+            for device in devices
+            if device.get("state") == "Booted"
+        ]
+    
+    async def resolve_device_id(self, device_id: str) -> str:
+        """
+        Resolve the "booted" alias to the UDID of the booted simulator.
+        
+        Uses the cached listing, so repeat calls within the TTL cost no
+        subprocess. The alias is kept when zero or several simulators are
+        booted, or when simctl cannot be queried.
+        
+        Args:
+            device_id: A simulator UDID or "booted"
+            
+        Returns:
+            The booted simulator's UDID for an unambiguous alias, else device_id
+        """
+        if device_id != "booted":
+            return device_id
+        
+        try:
+            listing = await self._get_listing()
+        except SimulatorError:
+            return device_id
+        
+        booted = [
+            device["udid"]
+            for devices in listing.get("devices", {}).values()
+            for device in devices
+            if device.get("state") == "Booted" and "udid" in device
+        ]
+        return booted[0] if len(booted) == 1 else device_id
+    
+    async def _get_listing(self) -> Dict[str, Any]:
+        """
+        Get the simctl device listing, from cache when fresh.
+        
+        Concurrent callers on a cold cache share a single simctl invocation.
+        
+        Returns:
+            Parsed `simctl list devices --json` output
+            
+        Raises:
+            SimulatorError: If unable to query simctl
+        """
+        if self._sim_cache is not None:
+            cached_at, listing = self._sim_cache
+            if time.monotonic() - cached_at < self._sim_cache_ttl:
+                self.logger.debug("🔍 Using cached simulator list")
+                return listing
+        
+        if self._pending_list is None:
+            self._pending_list = asyncio.ensure_future(self._fetch_listing())
+            self._pending_list.add_done_callback(self._clear_pending_list)
+        
+        # Shield so one cancelled caller does not cancel the shared fetch
+        return await asyncio.shield(self._pending_list)
+    
+    def _clear_pending_list(self, _future: "asyncio.Future") -> None:
+        """Forget the in-flight listing once it has completed."""
+        self._pending_list = None
+    
+    async def _fetch_listing(self) -> Dict[str, Any]:
+        """
+        Run `simctl list devices --json` once and cache the result.
+        
+        Returns:
+            Parsed simctl output
             
         Raises:
             SimulatorError: If unable to list simulators
@@ -43,26 +314,44 @@ class SimulatorManager:
         self.logger.info("📱 Listing available iOS simulators")
         
         try:
-            output, success = await run_command(["xcrun", "simctl", "list", "devices", "--json"])
+            version = self._sim_cache_version
+            
+            # Keep raw bytes: both parsers accept them, skipping a decode pass
+            output, success = await self._simctl("list", "devices", "--json", decode=False)
             
             if success:
                 # Parse JSON output to validate it
-                simulator_data = json.loads(output)
+                listing = _json_loads(output)
+                
+                async with self._sim_cache_lock:
+                    # Only cache if no boot/shutdown landed while simctl was running
+                    if self._sim_cache_version == version:
+                        self._sim_cache = (time.monotonic(), listing)
+                        self._booted = {
+                            device["udid"]
+                            for devices in listing.get("devices", {}).values()
+                            for device in devices
+                            if device.get("state") == "Booted" and "udid" in device
+                        }
                 self.logger.info("✅ Successfully retrieved simulator list")
-                self.logger.debug(f"🔍 Found {len(simulator_data.get('devices', {}))} device categories")
-                return simulator_data
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug("🔍 Found %d device categories", len(listing.get('devices', {})))
+                return listing
             else:
                 raise SimulatorError(
                     "Failed to list iOS simulators",
-                    context={"command_output": output}
+                    context={"command_output": output.decode("utf-8", errors="replace")}
                 )
                 
-        except json.JSONDecodeError as e:
+        except _JSON_DECODE_ERRORS as e:
             raise SimulatorError(
                 "Invalid JSON response from simctl list command",
-                context={"parse_error": str(e), "output": output[:500]}
+                context={"parse_error": str(e), "output": output[:500].decode("utf-8", errors="replace")}
             )
         except Exception as e:
+            if isinstance(e, SimulatorError):
+                raise
+            
             raise SimulatorError(
                 f"Unexpected error listing simulators: {str(e)}",
                 context={"error_type": type(e).__name__}
@@ -84,18 +373,26 @@ class SimulatorManager:
         if not device_id:
             raise SimulatorError("Device ID cannot be empty")
         
-        self.logger.info(f"🚀 Booting iOS simulator: {device_id}")
+        if self._is_known_booted(device_id):
+            self.logger.info("📱 Simulator already booted: %s", device_id)
+            return True
+        
+        self.logger.info("🚀 Booting iOS simulator: %s", device_id)
         
         try:
-            output, success = await run_command(["xcrun", "simctl", "boot", device_id])
+            output, success = await self._simctl("boot", device_id)
             
             if success:
-                self.logger.info(f"✅ Successfully booted simulator: {device_id}")
+                await self._record_device_state(device_id, "Booted")
+                self._booted.add(device_id)
+                self.logger.info("✅ Successfully booted simulator: %s", device_id)
                 return True
             else:
                 # Check if simulator is already booted (this is not an error)
-                if "Unable to boot device in current state: Booted" in output:
-                    self.logger.info(f"📱 Simulator already booted: {device_id}")
+                if _BENIGN_BOOT_RE.search(output):
+                    await self._record_device_state(device_id, "Booted")
+                    self._booted.add(device_id)
+                    self.logger.info("📱 Simulator already booted: %s", device_id)
                     return True
                 
                 raise SimulatorError(
@@ -103,7 +400,7 @@ class SimulatorManager:
                     context={
                         "device_id": device_id,
                         "command_output": output,
-                        "suggestion": "Check if device ID is valid and Xcode is properly installed"
+                        "suggestion": self._BOOT_SUGGESTION
                     }
                 )
                 
@@ -132,18 +429,22 @@ class SimulatorManager:
         if not device_id:
             raise SimulatorError("Device ID cannot be empty")
         
-        self.logger.info(f"🛑 Shutting down iOS simulator: {device_id}")
+        self.logger.info("🛑 Shutting down iOS simulator: %s", device_id)
         
         try:
-            output, success = await run_command(["xcrun", "simctl", "shutdown", device_id])
+            output, success = await self._simctl("shutdown", device_id)
             
             if success:
-                self.logger.info(f"✅ Successfully shutdown simulator: {device_id}")
+                await self._record_device_state(device_id, "Shutdown")
+                self._booted.discard(device_id)
+                self.logger.info("✅ Successfully shutdown simulator: %s", device_id)
                 return True
             else:
                 # Check if simulator is already shutdown (this is not an error)
-                if "Unable to shutdown device in current state: Shutdown" in output:
-                    self.logger.info(f"📱 Simulator already shutdown: {device_id}")
+                if _BENIGN_SHUTDOWN_RE.search(output):
+                    await self._record_device_state(device_id, "Shutdown")
+                    self._booted.discard(device_id)
+                    self.logger.info("📱 Simulator already shutdown: %s", device_id)
                     return True
                 
                 raise SimulatorError(
@@ -163,6 +464,57 @@ class SimulatorManager:
                 context={"device_id": device_id, "error_type": type(e).__name__}
             )
     
+    async def boot_simulators(self, device_ids: List[str]) -> Dict[str, Any]:
+        """
+        Boot several iOS simulators concurrently.
+        
+        Args:
+            device_ids: UDIDs of the simulators to boot
+            
+        Returns:
+            Mapping of device ID to True, or to the exception raised for that device
+        """
+        return await self._fan_out(self.boot_simulator, device_ids)
+    
+    async def shutdown_simulators(self, device_ids: List[str]) -> Dict[str, Any]:
+        """
+        Shutdown several iOS simulators concurrently.
+        
+        Args:
+            device_ids: UDIDs of the simulators to shutdown
+            
+        Returns:
+            Mapping of device ID to True, or to the exception raised for that device
+        """
+        return await self._fan_out(self.shutdown_simulator, device_ids)
+    
+    async def _fan_out(
+        self,
+        operation: Callable[[str], Awaitable[bool]],
+        device_ids: List[str]
+    ) -> Dict[str, Any]:
+        """
+        Run a per-device operation across devices, at most max_parallel at a time.
+        
+        Args:
+            operation: Coroutine function taking a device ID
+            device_ids: Device IDs to run the operation on
+            
+        Returns:
+            Mapping of device ID to the operation result or raised exception
+        """
+        sem = asyncio.Semaphore(self.max_parallel)
+        
+        async def bounded(device_id: str) -> bool:
+            async with sem:
+                return await operation(device_id)
+        
+        results = await asyncio.gather(
+            *(bounded(device_id) for device_id in device_ids),
+            return_exceptions=True
+        )
+        return dict(zip(device_ids, results))
+    
     async def launch_app(self, bundle_id: str, device_id: str = "booted") -> Dict[str, Any]:
         """
         Launch an application on the specified simulator.
@@ -180,13 +532,13 @@ class SimulatorManager:
         if not bundle_id:
             raise AppLaunchError("Bundle ID cannot be empty")
         
-        self.logger.info(f"🚀 Launching app '{bundle_id}' on device: {device_id}")
+        self.logger.info("🚀 Launching app '%s' on device: %s", bundle_id, device_id)
         
         try:
-            output, success = await run_command(["xcrun", "simctl", "launch", device_id, bundle_id])
+            output, success = await self._simctl("launch", device_id, bundle_id)
             
             if success:
-                self.logger.info(f"✅ Successfully launched app: {bundle_id}")
+                self.logger.info("✅ Successfully launched app: %s", bundle_id)
                 
                 # Parse process information from output if available
                 result = {
@@ -197,11 +549,10 @@ class SimulatorManager:
                 }
                 
                 # Extract process ID if present in output
-                lines = output.strip().split('\n')
-                for line in lines:
-                    if ':' in line and 'process' in line.lower():
-                        result["process_info"] = line.strip()
-                        break
+                match = _LAUNCH_PID_RE.search(output)
+                if match:
+                    result["process_info"] = match.group(0).strip()
+                    result["pid"] = int(match.group(2))
                 
                 return result
             else:
@@ -211,11 +562,7 @@ class SimulatorManager:
                         "bundle_id": bundle_id,
                         "device_id": device_id,
                         "command_output": output,
-                        "suggestions": [
-                            "Check if app is installed on simulator",
-                            "Verify bundle ID is correct",
-                            "Ensure simulator is booted"
-                        ]
+                        "suggestions": self._LAUNCH_SUGGESTIONS
                     }
                 )
                 
@@ -249,18 +596,19 @@ class SimulatorManager:
         if not bundle_id:
             raise AppLaunchError("Bundle ID cannot be empty")
         
-        self.logger.info(f"🛑 Terminating app '{bundle_id}' on device: {device_id}")
+        self.logger.info("🛑 Terminating app '%s' on device: %s", bundle_id, device_id)
         
         try:
-            output, success = await run_command(["xcrun", "simctl", "terminate", device_id, bundle_id])
+            # Raw bytes: the benign-failure check needs no decoded copy
+            output, success = await self._simctl("terminate", device_id, bundle_id, decode=False)
             
             if success:
-                self.logger.info(f"✅ Successfully terminated app: {bundle_id}")
+                self.logger.info("✅ Successfully terminated app: %s", bundle_id)
                 return True
             else:
                 # Check if app was not running (this might not be an error)
-                if "not running" in output.lower() or "no such process" in output.lower():
-                    self.logger.info(f"📱 App was not running: {bundle_id}")
+                if _NOT_RUNNING_RE.search(output):
+                    self.logger.info("📱 App was not running: %s", bundle_id)
                     return True
                 
                 raise AppLaunchError(
@@ -268,7 +616,7 @@ class SimulatorManager:
                     context={
                         "bundle_id": bundle_id,
                         "device_id": device_id,
-                        "command_output": output
+                        "command_output": output.decode("utf-8", errors="replace")
                     }
                 )
                 
@@ -298,35 +646,32 @@ class SimulatorManager:
         Raises:
             SimulatorError: If unable to list installed apps
         """
-        self.logger.info(f"📱 Listing installed apps on device: {device_id}")
+        self.logger.info("📱 Listing installed apps on device: %s", device_id)
         
         try:
-            output, success = await run_command(["xcrun", "simctl", "listapps", device_id])
+            output, success = await self._simctl("listapps", device_id, decode=False)
             
             if success:
                 self.logger.info("✅ Successfully retrieved installed apps list")
                 
-                # Parse the output to extract app information
-                apps = []
-                lines = output.strip().split('\n')
-                
-                for line in lines:
-                    line = line.strip()
-                    if line and not line.startswith('=') and ':' in line:
-                        # Basic parsing - this could be enhanced based on actual output format
-                        apps.append({
-                            "raw_info": line,
-                            "device_id": device_id
-                        })
+                # Parse the output to extract app information in a single regex scan;
+                # basic parsing - this could be enhanced based on actual output format
+                apps = [
+                    {
+                        "raw_info": match.group("line").decode("utf-8", errors="replace"),
+                        "device_id": device_id
+                    }
+                    for match in _APP_LINE_RE.finditer(output)
+                ]
                 
-                self.logger.debug(f"🔍 Found {len(apps)} installed apps")
+                self.logger.debug("🔍 Found %d installed apps", len(apps))
                 return apps
             else:
                 raise SimulatorError(
                     f"Failed to list installed apps on device {device_id}",
                     context={
                         "device_id": device_id,
-                        "command_output": output
+                        "command_output": output.decode("utf-8", errors="replace")
                     }
                 )
                 
@@ -337,4 +682,18 @@ class SimulatorManager:
             raise SimulatorError(
                 f"Unexpected error listing apps on device {device_id}: {str(e)}",
                 context={"device_id": device_id, "error_type": type(e).__name__}
-            ) 
\ No newline at end of file
+            ) 
+
+
+@lru_cache(maxsize=1)
+def get_simulator_manager() -> SimulatorManager:
+    """
+    Get the process-wide SimulatorManager.
+    
+    Sharing one instance lets every caller benefit from the same listing
+    cache and known-booted device set.
+    
+    Returns:
+        Shared SimulatorManager instance
+    """
+    return SimulatorManager()
@@ -9,7 +9,7 @@ import os
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class iOSConfig:
     """
     Configuration for iOS simulator and device settings.
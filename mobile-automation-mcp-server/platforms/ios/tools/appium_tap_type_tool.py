@@ -8,13 +8,8 @@ handling complex text field interactions with proper error handling.
 import asyncio
 import tempfile
 import os
-import sys
-from pathlib import Path
 from typing import Dict, Any, Optional, List
 
-# Add the mobile-automation-mcp-server directory to sys.path for proper imports
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
-
 from ..automation.appium_client import AppiumClient
 from config.settings import settings
 from shared.utils.logger import get_logger
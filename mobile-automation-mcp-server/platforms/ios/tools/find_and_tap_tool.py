@@ -9,13 +9,9 @@ with production-level error handling and logging.
 import asyncio
 import tempfile
 import os
-import sys
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Union
 
-# Add the mobile-automation-mcp-server directory to sys.path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
-
 from ..automation.appium_client import AppiumClient
 from config.settings import settings
 from shared.utils.logger import get_logger
@@ -277,9 +273,6 @@ class FindAndTapTool:
             Complete Python automation script as string
         """
         
-        # Import settings for configuration
-        from config.settings import settings
-        
         # Build strategy implementations
         strategy_implementations = []
         for i, strategy in enumerate(search_criteria["strategies"]):
@@ -304,7 +297,7 @@ try:
     from appium.webdriver.common.appiumby import AppiumBy
     from selenium.webdriver.support.ui import WebDriverWait
     from selenium.webdriver.support import expected_conditions as EC
-    from selenium.common.exceptions import TimeoutException, NoSuchElementException
+    from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 except ImportError as e:
     print(f"ERROR: Failed to import required packages: {{e}}")
     print("Make sure Appium Python client is installed in the virtual environment")
@@ -329,9 +322,16 @@ def main():
         print(f"📱 Connecting to device: {{options.device_name}}")
         driver = webdriver.Remote("{settings.appium.url}", options=options)
         
-        # Wait for app to be ready
-        time.sleep(2)
-        
+        # Wait for app to reach the foreground (state 4) instead of a fixed sleep
+        try:
+            WebDriverWait(
+                driver, 2, poll_frequency=0.1, ignored_exceptions=(WebDriverException,)
+            ).until(
+                lambda d: d.query_app_state("{app_bundle_id}") == 4
+            )
+        except WebDriverException:
+            print("⏰ App not reported in foreground, continuing")
+
         element = None
         successful_strategy = None
         
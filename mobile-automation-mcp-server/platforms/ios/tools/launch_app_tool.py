@@ -5,14 +5,9 @@ This tool provides functionality for launching iOS applications on simulators
 with proper error handling and process management.
 """
 
-import sys
-from pathlib import Path
 from typing import Dict, Any, List
 
-# Add the mobile-automation-mcp-server directory to sys.path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
-
-from ..automation.simulator_manager import SimulatorManager
+from ..automation.simulator_manager import get_simulator_manager
 from config.settings import settings
 from shared.utils.exceptions import AppLaunchError
 
@@ -27,7 +22,7 @@ class LaunchAppTool:
     
     def __init__(self):
         """Initialize the launch app tool."""
-        self.simulator_manager = SimulatorManager()
+        self.simulator_manager = get_simulator_manager()
     
     @property
     def name(self) -> str:
@@ -5,13 +5,8 @@ This tool provides functionality for taking screenshots of iOS simulators
 with proper error handling and file management.
 """
 
-import sys
-from pathlib import Path
 from typing import Dict, Any, Optional, List
 
-# Add the mobile-automation-mcp-server directory to sys.path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
-
 from ..automation.screenshot_service import ScreenshotService
 from shared.utils.exceptions import ScreenshotError
 
@@ -6,12 +6,24 @@ iOS, Android, and other automation platforms.
 """
 
 import os
+import re
 import sys
+from pathlib import Path
 from typing import Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
+# Matches the interpreter version recorded in a venv's pyvenv.cfg
+# ("version = 3.11.7" from stdlib venv, "version_info = 3.11.7" from uv)
+_PYVENV_VERSION_RE = re.compile(r"^version(?:_info)?\s*=\s*(\d+)\.(\d+)", re.MULTILINE)
 
-@dataclass
+# This module is in shared/config/, so the project root is 3 levels up
+_PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+
+# Interpreter version of the running server, used when the venv does not record one
+_RUNNING_PYTHON_VERSION = f"python{sys.version_info.major}.{sys.version_info.minor}"
+
+
+@dataclass(frozen=True, slots=True)
 class AppiumConfig:
     """
     Configuration for Appium server connection.
@@ -24,13 +36,19 @@ class AppiumConfig:
     port: int = 4723
     timeout: int = 60
     
+    # Server URL, built once since the config is immutable
+    _url: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, "_url", f"http://{self.host}:{self.port}")
+    
     @property
     def url(self) -> str:
         """Get the full Appium server URL."""
-        return f"http://{self.host}:{self.port}"
+        return self._url
 
 
-@dataclass 
+@dataclass(frozen=True, slots=True)
 class ServerConfig:
     """
     Configuration for the MCP server itself.
@@ -48,6 +66,41 @@ class ServerConfig:
     
     # Python version for site-packages path
     python_version: str = ""
+    
+    # Maximum simulators booted or shut down concurrently by bulk operations
+    max_parallel: int = 8
+    
+    # Maximum tool calls running xcrun simctl work at the same time
+    max_concurrent_simctl: int = 8
+    
+    # Maximum tool calls waiting on the Appium server at the same time
+    max_concurrent_appium: int = 16
+    
+    # Connection limit of the shared HTTP session used for Appium/WebDriver calls
+    http_pool_size: int = 16
+    
+    # Event loop uvicorn runs the server on (MCP_EVENT_LOOP): "auto" uses uvloop
+    # when the speedups extra is installed, "uvloop" requires it (falling back to
+    # asyncio if it is missing), "asyncio" forces the stdlib loop for debugging
+    event_loop: str = "auto"
+
+
+def _env_int(name: str, default: int) -> int:
+    """
+    Read a positive integer setting from the environment.
+    
+    Args:
+        name: Environment variable name
+        default: Value used when the variable is unset or not a positive integer
+        
+    Returns:
+        The configured value, or the default
+    """
+    try:
+        value = int(os.getenv(name, default))
+    except ValueError:
+        return default
+    return value if value > 0 else default
 
 
 def create_appium_config() -> AppiumConfig:
@@ -64,6 +117,28 @@ def create_appium_config() -> AppiumConfig:
     )
 
 
+def _detect_venv_python_version(venv_path: str) -> Optional[str]:
+    """
+    Read the interpreter version of a virtual environment from its pyvenv.cfg.
+    
+    Args:
+        venv_path: Path to the virtual environment
+        
+    Returns:
+        Version directory name (e.g. "python3.11"), or None if pyvenv.cfg
+        is missing or does not record a version
+    """
+    try:
+        cfg = (Path(venv_path) / "pyvenv.cfg").read_text()
+    except OSError:
+        return None
+    
+    match = _PYVENV_VERSION_RE.search(cfg)
+    if not match:
+        return None
+    return f"python{match.group(1)}.{match.group(2)}"
+
+
 def create_server_config(platform_name: str = "automation") -> ServerConfig:
     """
     Create ServerConfig from environment variables.
@@ -75,16 +150,21 @@ def create_server_config(platform_name: str = "automation") -> ServerConfig:
         ServerConfig instance with values from environment or defaults
     """
     # Determine paths relative to the project structure
-    # This function is in shared/config/, so project root is 3 levels up
-    from pathlib import Path
-    project_root = Path(__file__).parent.parent.parent.parent
-    default_venv_path = str(project_root / f"{platform_name}_mcp_env")
-    python_version = f"python{sys.version_info.major}.{sys.version_info.minor}"
+    default_venv_path = str(_PROJECT_ROOT / f"{platform_name}_mcp_env")
+    venv_path = os.getenv("VENV_PATH", default_venv_path)
+    
+    # Prefer the version the venv was actually built with; fall back to ours
+    python_version = _detect_venv_python_version(venv_path) or _RUNNING_PYTHON_VERSION
     
     return ServerConfig(
         name=os.getenv("MCP_SERVER_NAME", f"{platform_name}-automation-mcp"),
         version=os.getenv("MCP_SERVER_VERSION", "2.0.0"),
         log_level=os.getenv("LOG_LEVEL", "INFO"),
-        venv_path=os.getenv("VENV_PATH", default_venv_path),
-        python_version=os.getenv("PYTHON_VERSION", python_version)
+        venv_path=venv_path,
+        python_version=os.getenv("PYTHON_VERSION", python_version),
+        max_parallel=_env_int("MAX_PARALLEL_SIMULATORS", 8),
+        max_concurrent_simctl=_env_int("MAX_CONCURRENT_SIMCTL", 8),
+        max_concurrent_appium=_env_int("MAX_CONCURRENT_APPIUM", 16),
+        http_pool_size=_env_int("HTTP_POOL_SIZE", 16),
+        event_loop=os.getenv("MCP_EVENT_LOOP", "auto").lower()
     ) 
\ No newline at end of file
@@ -8,6 +8,7 @@ Modules:
 - logger: Colored logging with emojis for better terminal output
 - exceptions: Exception hierarchy for consistent error handling
 - command_runner: Safe shell command execution with timeout support
+- http_session: Shared pooled aiohttp session for Appium/WebDriver calls
 """
 
 from .logger import get_logger, ColoredFormatter
@@ -23,6 +24,7 @@ from .exceptions import (
     ValidationError
 )
 from .command_runner import CommandRunner, CommandResult, run_command
+from .http_session import get_http_session, close_http_session
 
 __version__ = "2.0.0"
 __all__ = [
@@ -44,5 +46,9 @@ __all__ = [
     # Command Runner
     "CommandRunner",
     "CommandResult", 
-    "run_command"
+    "run_command",
+    
+    # HTTP Session
+    "get_http_session",
+    "close_http_session"
 ]
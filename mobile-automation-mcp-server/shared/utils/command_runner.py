@@ -6,7 +6,9 @@ with proper logging, error handling, and timeout support across platforms.
 """
 
 import asyncio
-from typing import List, Tuple, Optional, Dict, Any
+import logging
+import time
+from typing import List, Tuple, Optional, Dict, Any, Union
 from dataclasses import dataclass
 
 from .logger import get_logger
@@ -15,6 +17,44 @@ from .exceptions import AutomationMCPError
 logger = get_logger(__name__)
 
 
+class _CommandLine:
+    """Defer joining an argv list until a log record actually renders it."""
+    
+    __slots__ = ("argv",)
+    
+    def __init__(self, argv: List[str]):
+        self.argv = argv
+    
+    def __str__(self) -> str:
+        return " ".join(self.argv)
+
+
+class _LazyCommandField:
+    """
+    Dataclass field descriptor for a command line.
+    
+    Accepts the command as a string or as its argv list, stored privately; a
+    list is only joined into the string the first time the field is read.
+    """
+    
+    def __set_name__(self, owner: type, name: str):
+        self._name = name
+        self._attr = f"_{name}"
+    
+    def __get__(self, obj: Any, objtype: Optional[type] = None) -> str:
+        if obj is None:
+            # No class-level default, so the dataclass field stays required
+            raise AttributeError(self._name)
+        value = getattr(obj, self._attr)
+        if not isinstance(value, str):
+            value = " ".join(value)
+            setattr(obj, self._attr, value)
+        return value
+    
+    def __set__(self, obj: Any, value: Union[str, List[str]]) -> None:
+        setattr(obj, self._attr, value)
+
+
 @dataclass
 class CommandResult:
     """
@@ -24,15 +64,15 @@ class CommandResult:
     with clear success/failure indication.
     """
     
-    command: str
+    command: str = _LazyCommandField()
     return_code: int
-    stdout: str
-    stderr: str
+    stdout: Union[str, bytes]
+    stderr: Union[str, bytes]
     success: bool
     execution_time: float
     
     @property
-    def output(self) -> str:
+    def output(self) -> Union[str, bytes]:
         """Get the primary output (stdout if success, stderr if failure)."""
         return self.stdout if self.success else self.stderr
     
@@ -65,7 +105,10 @@ class CommandRunner:
         command: List[str], 
         timeout: Optional[float] = None,
         cwd: Optional[str] = None,
-        env: Optional[Dict[str, str]] = None
+        env: Optional[Dict[str, str]] = None,
+        decode: bool = True,
+        close_fds: bool = True,
+        start_new_session: bool = True
     ) -> CommandResult:
         """
         Execute a shell command asynchronously.
@@ -75,6 +118,9 @@ class CommandRunner:
             timeout: Timeout override for this command
             cwd: Working directory for command execution
             env: Environment variables for the command
+            decode: Decode stdout/stderr as UTF-8; when False the raw bytes are kept
+            close_fds: Close inherited file descriptors in the child
+            start_new_session: Run the child in its own session
             
         Returns:
             CommandResult with execution details
@@ -83,23 +129,28 @@ class CommandRunner:
             AutomationMCPError: If command execution fails critically
         """
         
-        cmd_str = " ".join(command)
+        cmd_line = _CommandLine(command)
         effective_timeout = timeout or self.timeout
         
-        self.logger.info(f"🚧 Executing command: {cmd_str}")
+        self.logger.info("🚧 Executing command: %s", cmd_line)
         if cwd:
-            self.logger.debug(f"📁 Working directory: {cwd}")
+            self.logger.debug("📁 Working directory: %s", cwd)
         
-        start_time = asyncio.get_event_loop().time()
+        start_time = time.monotonic()
         
         try:
-            # Create subprocess with proper configuration
+            # Exec the argv directly (no intermediate shell); by default detach
+            # stdin and start a new session so the child holds none of our stdio
+            # handles. Callers may disable both to let CPython use posix_spawn.
             process = await asyncio.create_subprocess_exec(
                 *command,
+                stdin=asyncio.subprocess.DEVNULL,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
                 cwd=cwd,
-                env=env
+                env=env,
+                close_fds=close_fds,
+                start_new_session=start_new_session
             )
             
             # Wait for completion with timeout
@@ -108,15 +159,18 @@ class CommandRunner:
                 timeout=effective_timeout
             )
             
-            execution_time = asyncio.get_event_loop().time() - start_time
+            execution_time = time.monotonic() - start_time
             
-            # Decode output
-            stdout_str = stdout.decode('utf-8', errors='replace')
-            stderr_str = stderr.decode('utf-8', errors='replace')
+            # Decode output unless the caller wants the raw bytes
+            if decode:
+                stdout_str = stdout.decode('utf-8', errors='replace')
+                stderr_str = stderr.decode('utf-8', errors='replace')
+            else:
+                stdout_str, stderr_str = stdout, stderr
             
             # Create result object
             result = CommandResult(
-                command=cmd_str,
+                command=command,
                 return_code=process.returncode,
                 stdout=stdout_str,
                 stderr=stderr_str,
@@ -126,20 +180,25 @@ class CommandRunner:
             
             # Log result
             if result.success:
-                self.logger.info(f"✅ Command succeeded: {cmd_str} ({execution_time:.2f}s)")
-                if stdout_str.strip():
-                    self.logger.debug(f"📤 Output: {stdout_str.strip()}")
+                self.logger.info("✅ Command succeeded: %s (%.2fs)", cmd_line, execution_time)
+                if self.logger.isEnabledFor(logging.DEBUG) and stdout.strip():
+                    if decode:
+                        self.logger.debug("📤 Output: %s", stdout_str.strip())
+                    else:
+                        # Raw output may be binary (e.g. PNG data); log its size only
+                        self.logger.debug("📤 Output: %d bytes", len(stdout))
             else:
-                self.logger.error(f"❌ Command failed: {cmd_str} (exit {process.returncode})")
-                if stderr_str.strip():
-                    self.logger.error(f"📥 Error: {stderr_str.strip()}")
+                self.logger.error("❌ Command failed: %s (exit %s)", cmd_line, process.returncode)
+                if stderr.strip():
+                    self.logger.error("📥 Error: %s", stderr.decode('utf-8', errors='replace').strip())
             
             return result
             
         except asyncio.TimeoutError:
-            execution_time = asyncio.get_event_loop().time() - start_time
+            execution_time = time.monotonic() - start_time
+            cmd_str = str(cmd_line)
             error_msg = f"Command timed out after {effective_timeout}s: {cmd_str}"
-            self.logger.error(f"⏰ {error_msg}")
+            self.logger.error("⏰ %s", error_msg)
             
             # Try to terminate the process
             try:
@@ -161,9 +220,10 @@ class CommandRunner:
             )
             
         except Exception as e:
-            execution_time = asyncio.get_event_loop().time() - start_time
+            execution_time = time.monotonic() - start_time
+            cmd_str = str(cmd_line)
             error_msg = f"Failed to execute command: {cmd_str}"
-            self.logger.error(f"💥 {error_msg}: {str(e)}")
+            self.logger.error("💥 %s: %s", error_msg, e)
             
             raise AutomationMCPError(
                 error_msg,
@@ -174,7 +234,7 @@ class CommandRunner:
                 }
             )
     
-    async def run_simple(self, command: List[str]) -> Tuple[str, bool]:
+    async def run_simple(self, command: List[str], **kwargs) -> Tuple[Union[str, bytes], bool]:
         """
         Simplified command execution that returns just output and success status.
         
@@ -183,23 +243,26 @@ class CommandRunner:
         
         Args:
             command: Command and arguments as a list
+            **kwargs: Additional arguments passed to run()
             
         Returns:
             Tuple of (output, success_boolean)
         """
         try:
-            result = await self.run(command)
+            result = await self.run(command, **kwargs)
             return result.output, result.success
         except AutomationMCPError as e:
-            self.logger.error(f"Command execution failed: {e}")
-            return str(e), False
+            self.logger.error("Command execution failed: %s", e)
+            # Keep the output type consistent with what the caller asked for
+            message = str(e)
+            return (message if kwargs.get("decode", True) else message.encode("utf-8")), False
 
 
 # Global command runner instance for convenience
 default_runner = CommandRunner()
 
 
-async def run_command(command: List[str], **kwargs) -> Tuple[str, bool]:
+async def run_command(command: List[str], **kwargs) -> Tuple[Union[str, bytes], bool]:
     """
     Convenience function for running commands with the default runner.
     
@@ -212,4 +275,4 @@ async def run_command(command: List[str], **kwargs) -> Tuple[str, bool]:
     Returns:
         Tuple of (output, success_boolean)
     """
-    return await default_runner.run_simple(command) 
\ No newline at end of file
+    return await default_runner.run_simple(command, **kwargs) 
\ No newline at end of file
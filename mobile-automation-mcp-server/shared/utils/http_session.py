@@ -0,0 +1,55 @@
+"""
+Shared HTTP client session for cross-platform automation.
+
+This module owns a single pooled aiohttp session so every Appium/WebDriver
+request reuses keep-alive connections instead of opening a new TCP (and TLS)
+connection per call.
+"""
+
+from typing import Optional
+
+import aiohttp
+
+from config.settings import get_settings
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Idle keep-alive connections are dropped after this many seconds
+HTTP_KEEPALIVE_TIMEOUT = 75.0
+
+_session: Optional[aiohttp.ClientSession] = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    Get the process-wide aiohttp session, creating it on first use.
+    
+    Must be called from within a running event loop. A closed session is
+    transparently replaced.
+    
+    Returns:
+        Shared aiohttp.ClientSession backed by a keep-alive connection pool
+    """
+    global _session
+    
+    if _session is None or _session.closed:
+        pool_size = get_settings().server.http_pool_size
+        connector = aiohttp.TCPConnector(
+            limit=pool_size,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT
+        )
+        _session = aiohttp.ClientSession(connector=connector)
+        logger.debug("🔌 Created shared HTTP session (pool size %d)", pool_size)
+    
+    return _session
+
+
+async def close_http_session() -> None:
+    """Close the shared session and its pooled connections, if open."""
+    global _session
+    
+    if _session is not None and not _session.closed:
+        await _session.close()
+        logger.debug("🔌 Closed shared HTTP session")
+    _session = None
@@ -8,13 +8,8 @@ across iOS, Android, and other automation platforms.
 import os
 import sys
 import logging
-from pathlib import Path
 from typing import Optional
 
-# Add the mobile-automation-mcp-server directory to sys.path
-mobile_automation_mcp_server_dir = Path(__file__).parent.parent.parent.resolve()
-sys.path.insert(0, str(mobile_automation_mcp_server_dir))
-
 from config.settings import settings
 
 
@@ -34,22 +29,22 @@ class ColoredFormatter(logging.Formatter):
         'RESET': '\033[0m'        # Reset
     }
     
+    # Emoji indicators for different log levels
+    EMOJIS = {
+        'DEBUG': '🔍',
+        'INFO': '✅', 
+        'WARNING': '⚠️',
+        'ERROR': '❌',
+        'CRITICAL': '💥'
+    }
+    
     def format(self, record: logging.LogRecord) -> str:
         """Format log record with colors and emojis for better UX."""
         
-        # Add emoji indicators for different log levels
-        emoji_map = {
-            'DEBUG': '🔍',
-            'INFO': '✅', 
-            'WARNING': '⚠️',
-            'ERROR': '❌',
-            'CRITICAL': '💥'
-        }
-        
         # Get color and emoji for this log level
         color = self.COLORS.get(record.levelname, '')
         reset = self.COLORS['RESET']
-        emoji = emoji_map.get(record.levelname, '📝')
+        emoji = self.EMOJIS.get(record.levelname, '📝')
         
         # Create colored log message
         colored_levelname = f"{color}{record.levelname}{reset}"
@@ -0,0 +1,100 @@
+"""
+Tests for the SimulatorManager listing cache.
+"""
+
+import json
+import unittest
+
+from platforms.ios.automation.simulator_manager import SimulatorManager
+from shared.utils.exceptions import SimulatorError
+
+_LISTING = json.dumps({
+    "devices": {
+        "com.apple.CoreSimulator.SimRuntime.iOS-18-0": [
+            {"udid": "AAAA", "name": "iPhone 16", "state": "Shutdown"},
+            {"udid": "BBBB", "name": "iPhone 16 Pro", "state": "Booted"}
+        ]
+    }
+}).encode()
+
+
+class _StubSimulatorManager(SimulatorManager):
+    """SimulatorManager whose simctl calls return a canned listing."""
+    
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+    
+    async def _simctl(self, *tail, **kwargs):
+        self.calls.append(tail)
+        if tail[0] == "list":
+            return _LISTING, True
+        if tail[-1] == "BAD":
+            return "Invalid device: BAD", False
+        return "", True
+
+
+class ListingCacheTest(unittest.IsolatedAsyncioTestCase):
+    
+    async def test_changing_a_listing_leaves_the_cache_untouched(self):
+        manager = _StubSimulatorManager()
+        
+        listing = await manager.list_simulators()
+        devices = listing["devices"]["com.apple.CoreSimulator.SimRuntime.iOS-18-0"]
+        devices[0]["state"] = "Booted"
+        devices.append({"udid": "CCCC", "name": "iPhone SE", "state": "Booted"})
+        
+        again = await manager.list_simulators()
+        devices = again["devices"]["com.apple.CoreSimulator.SimRuntime.iOS-18-0"]
+        self.assertEqual(len(devices), 2)
+        self.assertEqual(devices[0]["state"], "Shutdown")
+        self.assertEqual(len(manager.calls), 1)
+    
+    async def test_state_change_does_not_alter_earlier_listings(self):
+        manager = _StubSimulatorManager()
+        
+        before = await manager.list_simulators()
+        await manager.boot_simulator("AAAA")
+        after = await manager.list_simulators()
+        
+        runtime = "com.apple.CoreSimulator.SimRuntime.iOS-18-0"
+        self.assertEqual(before["devices"][runtime][0]["state"], "Shutdown")
+        self.assertEqual(after["devices"][runtime][0]["state"], "Booted")
+        self.assertEqual([call[0] for call in manager.calls], ["list", "boot"])
+
+
+    
+    async def test_booted_alias_resolves_to_the_booted_udid(self):
+        manager = _StubSimulatorManager()
+        
+        self.assertEqual(await manager.resolve_device_id("booted"), "BBBB")
+        self.assertEqual(await manager.resolve_device_id("AAAA"), "AAAA")
+        
+        # Ambiguous once a second simulator is booted
+        await manager.boot_simulator("AAAA")
+        self.assertEqual(await manager.resolve_device_id("booted"), "booted")
+
+
+class FanOutTest(unittest.IsolatedAsyncioTestCase):
+    
+    async def test_boot_simulators_reports_each_device(self):
+        manager = _StubSimulatorManager()
+        
+        results = await manager.boot_simulators(["AAAA", "BAD", "BBBB"])
+        
+        self.assertEqual(list(results), ["AAAA", "BAD", "BBBB"])
+        self.assertIs(results["AAAA"], True)
+        self.assertIs(results["BBBB"], True)
+        self.assertIsInstance(results["BAD"], SimulatorError)
+    
+    async def test_shutdown_simulators_reports_each_device(self):
+        manager = _StubSimulatorManager()
+        
+        results = await manager.shutdown_simulators(["AAAA", "BBBB"])
+        
+        self.assertEqual(results, {"AAAA": True, "BBBB": True})
+        self.assertEqual(sorted(call[1] for call in manager.calls), ["AAAA", "BBBB"])
+
+
+if __name__ == "__main__":
+    unittest.main()